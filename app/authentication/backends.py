@@ -0,0 +1,31 @@
+from django.contrib.auth.backends import ModelBackend
+from .models import User
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authenticate by email with a single narrow SELECT
+    """
+    # Columns needed by authenticate(), login() and the login success message
+    login_fields = (
+        'id', 'password', 'is_active', 'email', 'username',
+        'first_name', 'last_name', 'last_login'
+    )
+    
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        
+        try:
+            user = User.objects.only(*self.login_fields).get(email=username)
+        except User.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user.
+            User().set_password(password)
+            return None
+        
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -3,14 +3,17 @@ from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, Pass
 from django.contrib.auth import authenticate
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Submit, Row, Column, Field, HTML, Div
 from crispy_forms.bootstrap import FormActions
+from hello_django.forms import LazyFormHelperMixin
 from .models import User
 import re
 
 
-class CustomUserCreationForm(UserCreationForm):
+_EMAIL_RE = re.compile(r'\A[^\s@]+@[^\s@]+\.[^\s@]+\Z')
+
+
+class CustomUserCreationForm(LazyFormHelperMixin, UserCreationForm):
     """
     Simplified user registration form with essential fields only
     """
@@ -50,34 +53,34 @@ class CustomUserCreationForm(UserCreationForm):
         model = User
         fields = ('email', 'first_name', 'last_name', 'password1', 'password2')
     
+    _LAYOUT = Layout(
+        Row(
+            Column('first_name', css_class='form-group col-md-6 mb-3'),
+            Column('last_name', css_class='form-group col-md-6 mb-3'),
+            css_class='form-row'
+        ),
+        Row(
+            Column('username', css_class='form-group col-md-6 mb-3'),
+            Column('email', css_class='form-group col-md-6 mb-3'),
+            css_class='form-row'
+        ),
+        Row(
+            Column('password1', css_class='form-group col-md-6 mb-3'),
+            Column('password2', css_class='form-group col-md-6 mb-3'),
+            css_class='form-row'
+        ),
+        Div(
+            Field('terms_accepted', css_class='form-check mb-3'),
+            css_class='form-group'
+        ),
+        FormActions(
+            Submit('submit', 'Create Account', css_class='btn btn-primary btn-lg w-100'),
+            css_class='text-center'
+        )
+    )
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.layout = Layout(
-            Row(
-                Column('first_name', css_class='form-group col-md-6 mb-3'),
-                Column('last_name', css_class='form-group col-md-6 mb-3'),
-                css_class='form-row'
-            ),
-            Row(
-                Column('username', css_class='form-group col-md-6 mb-3'),
-                Column('email', css_class='form-group col-md-6 mb-3'),
-                css_class='form-row'
-            ),
-            Row(
-                Column('password1', css_class='form-group col-md-6 mb-3'),
-                Column('password2', css_class='form-group col-md-6 mb-3'),
-                css_class='form-row'
-            ),
-            Div(
-                Field('terms_accepted', css_class='form-check mb-3'),
-                css_class='form-group'
-            ),
-            FormActions(
-                Submit('submit', 'Create Account', css_class='btn btn-primary btn-lg w-100'),
-                css_class='text-center'
-            )
-        )
         
         # Update password field widgets
         self.fields['password1'].widget.attrs.update({
@@ -89,12 +92,6 @@ class CustomUserCreationForm(UserCreationForm):
             'placeholder': 'Confirm your password'
         })
     
-    def clean_email(self):
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email=email).exists():
-            raise ValidationError('A user with this email already exists.')
-        return email
-    
     def save(self, commit=True):
         user = super().save(commit=False)
         user.email = self.cleaned_data['email']
@@ -106,7 +103,7 @@ class CustomUserCreationForm(UserCreationForm):
         return user
 
 
-class CustomAuthenticationForm(AuthenticationForm):
+class CustomAuthenticationForm(LazyFormHelperMixin, AuthenticationForm):
     """
     Custom login form with enhanced styling and validation
     """
@@ -133,18 +130,15 @@ class CustomAuthenticationForm(AuthenticationForm):
         label='Remember me for 30 days'
     )
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.layout = Layout(
-            Field('username', css_class='form-group mb-3'),
-            Field('password', css_class='form-group mb-3'),
-            Field('remember_me', css_class='form-check mb-3'),
-            FormActions(
-                Submit('submit', 'Sign In', css_class='btn btn-primary btn-lg w-100'),
-                css_class='text-center'
-            )
+    _LAYOUT = Layout(
+        Field('username', css_class='form-group mb-3'),
+        Field('password', css_class='form-group mb-3'),
+        Field('remember_me', css_class='form-check mb-3'),
+        FormActions(
+            Submit('submit', 'Sign In', css_class='btn btn-primary btn-lg w-100'),
+            css_class='text-center'
         )
+    )
     
     def clean(self):
         username = self.cleaned_data.get('username')
@@ -167,7 +161,7 @@ class CustomAuthenticationForm(AuthenticationForm):
         return self.cleaned_data
 
 
-class CustomPasswordResetForm(PasswordResetForm):
+class CustomPasswordResetForm(LazyFormHelperMixin, PasswordResetForm):
     """
     Custom password reset form
     """
@@ -180,19 +174,16 @@ class CustomPasswordResetForm(PasswordResetForm):
         help_text='Enter the email address associated with your account.'
     )
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.layout = Layout(
-            Field('email', css_class='form-group mb-3'),
-            FormActions(
-                Submit('submit', 'Send Reset Link', css_class='btn btn-primary btn-lg w-100'),
-                css_class='text-center'
-            )
+    _LAYOUT = Layout(
+        Field('email', css_class='form-group mb-3'),
+        FormActions(
+            Submit('submit', 'Send Reset Link', css_class='btn btn-primary btn-lg w-100'),
+            css_class='text-center'
         )
+    )
 
 
-class CustomSetPasswordForm(SetPasswordForm):
+class CustomSetPasswordForm(LazyFormHelperMixin, SetPasswordForm):
     """
     Custom set password form for password reset
     """
@@ -212,20 +203,17 @@ class CustomSetPasswordForm(SetPasswordForm):
         label='Confirm New Password'
     )
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.layout = Layout(
-            Field('new_password1', css_class='form-group mb-3'),
-            Field('new_password2', css_class='form-group mb-3'),
-            FormActions(
-                Submit('submit', 'Set New Password', css_class='btn btn-primary btn-lg w-100'),
-                css_class='text-center'
-            )
+    _LAYOUT = Layout(
+        Field('new_password1', css_class='form-group mb-3'),
+        Field('new_password2', css_class='form-group mb-3'),
+        FormActions(
+            Submit('submit', 'Set New Password', css_class='btn btn-primary btn-lg w-100'),
+            css_class='text-center'
         )
+    )
 
 
-class UserProfileForm(forms.ModelForm):
+class UserProfileForm(LazyFormHelperMixin, forms.ModelForm):
     """
     Minimal user profile editing form
     """
@@ -238,35 +226,32 @@ class UserProfileForm(forms.ModelForm):
             'email': forms.EmailInput(attrs={'class': 'form-control'}),
         }
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.layout = Layout(
-            HTML('<h5 class="mb-3">Personal Information</h5>'),
-            Row(
-                Column('first_name', css_class='form-group col-md-6 mb-3'),
-                Column('last_name', css_class='form-group col-md-6 mb-3'),
-                css_class='form-row'
-            ),
-            Field('email', css_class='form-group mb-3'),
+    _LAYOUT = Layout(
+        HTML('<h5 class="mb-3">Personal Information</h5>'),
+        Row(
+            Column('first_name', css_class='form-group col-md-6 mb-3'),
+            Column('last_name', css_class='form-group col-md-6 mb-3'),
+            css_class='form-row'
+        ),
+        Field('email', css_class='form-group mb-3'),
             
-            FormActions(
-                Submit('submit', 'Update Profile', css_class='btn btn-primary btn-lg'),
-                HTML('<a href="{% url \'authentication:profile\' %}" class="btn btn-secondary btn-lg ms-2">Cancel</a>'),
-                css_class='text-center mt-4'
-            )
+        FormActions(
+            Submit('submit', 'Update Profile', css_class='btn btn-primary btn-lg'),
+            HTML('<a href="{% url \'authentication:profile\' %}" class="btn btn-secondary btn-lg ms-2">Cancel</a>'),
+            css_class='text-center mt-4'
         )
+    )
     
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if email and User.objects.filter(email=email).exclude(pk=self.instance.pk).exists():
+        if email and User.objects.filter(email=email).exclude(pk=self.instance.pk).values('pk').exists():
             raise ValidationError('A user with this email already exists.')
         return email
     
 
 
 
-class ChangePasswordForm(forms.Form):
+class ChangePasswordForm(LazyFormHelperMixin, forms.Form):
     """
     Form for changing user password
     """
@@ -294,19 +279,19 @@ class ChangePasswordForm(forms.Form):
         label='Confirm New Password'
     )
     
+    _LAYOUT = Layout(
+        Field('current_password', css_class='form-group mb-3'),
+        Field('new_password1', css_class='form-group mb-3'),
+        Field('new_password2', css_class='form-group mb-3'),
+        FormActions(
+            Submit('submit', 'Change Password', css_class='btn btn-primary btn-lg'),
+            css_class='text-center'
+        )
+    )
+    
     def __init__(self, user, *args, **kwargs):
         self.user = user
         super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.layout = Layout(
-            Field('current_password', css_class='form-group mb-3'),
-            Field('new_password1', css_class='form-group mb-3'),
-            Field('new_password2', css_class='form-group mb-3'),
-            FormActions(
-                Submit('submit', 'Change Password', css_class='btn btn-primary btn-lg'),
-                css_class='text-center'
-            )
-        )
     
     def clean_current_password(self):
         current_password = self.cleaned_data.get('current_password')
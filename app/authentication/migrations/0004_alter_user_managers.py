@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:34
+
+import authentication.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_remove_emailverificationtoken_user_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', authentication.models.CachedExistsManager()),
+            ],
+        ),
+    ]
@@ -1,15 +1,44 @@
-from django.contrib.auth.models import AbstractUser
+import hashlib
+
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.cache import cache
 from django.db import models
+from django.db.models.functions import Upper
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+class CachedExistsManager(UserManager):
+    """
+    User manager with a short-lived cache for unique-field existence probes
+    """
+    exists_cache_timeout = 5  # seconds
+
+    @staticmethod
+    def exists_cache_key(field, value):
+        digest = hashlib.md5(str(value).encode('utf-8')).hexdigest()
+        return f'user_{field}_exists:{digest}'
+
+    def exists_by(self, field, value):
+        """Return whether a user with ``field == value`` exists, consulting the cache first."""
+        return cache.get_or_set(
+            self.exists_cache_key(field, value),
+            lambda: self.filter(**{field: value}).exists(),
+            self.exists_cache_timeout
+        )
 
 
 class User(AbstractUser):
     """
     Minimal User model for basic authentication
     """
+    # unique=True already backs email lookups with a B-tree index
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=150, blank=False)
     last_name = models.CharField(max_length=150, blank=False)
     
+    objects = CachedExistsManager()
+    
     # Make email the username field
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
@@ -18,6 +47,20 @@ class User(AbstractUser):
         db_table = 'auth_user'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Serves case-insensitive username__iexact lookups
+            models.Index(Upper('username'), name='user_username_upper_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored unique values so a rename can invalidate the old cache keys
+        instance._loaded_unique_values = {
+            field: instance.__dict__[field]
+            for field in ('email', 'username') if field in instance.__dict__
+        }
+        return instance
     
     def __str__(self):
         return f"{self.get_full_name()} ({self.email})"
@@ -26,3 +69,17 @@ class User(AbstractUser):
         """Return the first_name plus the last_name, with a space in between."""
         full_name = f"{self.first_name} {self.last_name}"
         return full_name.strip()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_exists_cache(sender, instance, **kwargs):
+    """Drop cached existence probes for the user's current and previously stored unique fields"""
+    loaded = getattr(instance, '_loaded_unique_values', {})
+    emails = {instance.email, loaded.get('email', instance.email)}
+    usernames = {instance.username, loaded.get('username', instance.username)}
+    keys = [CachedExistsManager.exists_cache_key('email', email) for email in emails]
+    for username in usernames:
+        keys.append(CachedExistsManager.exists_cache_key('username', username))
+        keys.append(CachedExistsManager.exists_cache_key('username__iexact', username.lower()))
+    cache.delete_many(keys)
+    instance._loaded_unique_values = {'email': instance.email, 'username': instance.username}
@@ -2,6 +2,8 @@ from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
+from .forms import CustomUserCreationForm
+
 User = get_user_model()
 
 
@@ -60,3 +62,98 @@ class LoginViewTests(TestCase):
         })
         self.assertFalse(response.context['user'].is_authenticated)
         self.assertTemplateUsed(response, 'authentication/login.html')
+
+
+class CachedExistsManagerTests(TestCase):
+    def test_exists_by_is_invalidated_on_save(self):
+        self.assertFalse(User.objects.exists_by('email', 'cached@example.com'))
+        User.objects.create_user(
+            username='cacheduser',
+            email='cached@example.com',
+            password='testpassword'
+        )
+        self.assertTrue(User.objects.exists_by('email', 'cached@example.com'))
+        self.assertTrue(User.objects.exists_by('username', 'cacheduser'))
+
+    def test_rename_invalidates_old_values(self):
+        User.objects.create_user(
+            username='olduser',
+            email='old@example.com',
+            password='testpassword'
+        )
+        self.assertTrue(User.objects.exists_by('email', 'old@example.com'))
+        self.assertTrue(User.objects.exists_by('username__iexact', 'olduser'))
+        user = User.objects.get(email='old@example.com')
+        user.email = 'new@example.com'
+        user.username = 'newuser'
+        user.save()
+        self.assertFalse(User.objects.exists_by('email', 'old@example.com'))
+        self.assertFalse(User.objects.exists_by('username__iexact', 'olduser'))
+        self.assertTrue(User.objects.exists_by('email', 'new@example.com'))
+
+
+class RegistrationDuplicateEmailTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username='existing',
+            email='taken@example.com',
+            password='testpassword'
+        )
+        self.data = {
+            'username': 'newcomer',
+            'email': 'taken@example.com',
+            'first_name': 'New',
+            'last_name': 'Comer',
+            'password1': 'S3cure-pass-phrase',
+            'password2': 'S3cure-pass-phrase',
+            'terms_accepted': 'on'
+        }
+
+    def test_form_reports_duplicate_email(self):
+        form = CustomUserCreationForm(data=self.data)
+        self.assertFalse(form.is_valid())
+        self.assertIn('email', form.errors)
+
+    def test_register_view_reports_duplicate_email(self):
+        response = self.client.post(reverse('authentication:register'), self.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('email', response.context['form'].errors)
+        self.assertEqual(User.objects.filter(email='taken@example.com').count(), 1)
+
+
+class AvailabilityCheckTests(TestCase):
+    def test_email_check_reflects_new_registration(self):
+        url = reverse('authentication:check_email')
+        response = self.client.get(url, {'email': 'fresh@example.com'})
+        self.assertTrue(response.json()['available'])
+        User.objects.create_user(
+            username='freshuser',
+            email='fresh@example.com',
+            password='testpassword'
+        )
+        response = self.client.get(url, {'email': 'fresh@example.com'})
+        self.assertFalse(response.json()['available'])
+
+
+class ProfileDisplayNameTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword',
+            first_name='Test',
+            last_name='User'
+        )
+        self.client.force_login(self.user)
+
+    def test_navbar_falls_back_to_full_name_without_session_value(self):
+        response = self.client.get(reverse('bank_statement:statement_list'))
+        self.assertContains(response, 'Test User')
+
+    def test_profile_edit_refreshes_session_full_name(self):
+        self.client.post(reverse('authentication:profile_edit'), {
+            'first_name': 'Renamed',
+            'last_name': 'User',
+            'email': 'test@example.com'
+        })
+        self.assertEqual(self.client.session['full_name'], 'Renamed User')
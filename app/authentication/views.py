@@ -15,20 +15,29 @@ from django.http import JsonResponse, HttpResponseRedirect
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.conf import settings
-from django.db import transaction
+from django.db import IntegrityError, connection, transaction
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.utils.html import escape
+from django.core.cache import cache
 from .forms import (
     CustomUserCreationForm, CustomAuthenticationForm, CustomPasswordResetForm,
-    CustomSetPasswordForm, UserProfileForm, ChangePasswordForm
+    CustomSetPasswordForm, UserProfileForm, ChangePasswordForm, _EMAIL_RE
 )
 from .models import User
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
+# Outbound mail is sent off the request thread so SMTP latency never blocks a response
+_email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='auth-email')
+
+_WELCOME_EMAIL_SHELL_CACHE_KEY = 'authentication:welcome_email_shell'
+_WELCOME_FIRST_NAME_TOKEN = '__welcome_first_name__'
+_WELCOME_EMAIL_TOKEN = '__welcome_email__'
+
 
 class CustomLoginView(LoginView):
     """
@@ -55,8 +64,14 @@ class CustomLoginView(LoginView):
         else:
             self.request.session.set_expiry(0)  # Browser session
         
-        messages.success(self.request, f'Welcome back, {user.get_full_name() or user.username}!')
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        
+        # Cache the display name on the session so templates don't rebuild it per render
+        full_name = user.get_full_name() or user.username
+        self.request.session['full_name'] = full_name
+        
+        messages.success(self.request, f'Welcome back, {full_name}!')
+        return response
     
     def form_invalid(self, form):
         """Handle failed login attempts"""
@@ -81,7 +96,8 @@ class CustomLogoutView(LogoutView):
     template_name = 'authentication/logout.html'
     
     def dispatch(self, request, *args, **kwargs):
-        if request.user.is_authenticated:
+        # Only browsers will see the flash; skip the message store write for API clients
+        if request.user.is_authenticated and 'text/html' in request.headers.get('Accept', ''):
             messages.success(request, 'You have been successfully logged out.')
         
         return super().dispatch(request, *args, **kwargs)
@@ -90,12 +106,26 @@ class CustomLogoutView(LogoutView):
         return reverse_lazy('authentication:login')
 
 
+class _RegisterForm(CustomUserCreationForm):
+    """
+    Registration form that leaves email uniqueness to the database constraint;
+    only valid inside RegisterView.form_valid, which reports the IntegrityError
+    """
+    def validate_unique(self):
+        exclude = self._get_validation_exclusions()
+        exclude.add('email')
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+
+
 class RegisterView(CreateView):
     """
     User registration view
     """
     model = User
-    form_class = CustomUserCreationForm
+    form_class = _RegisterForm
     template_name = 'authentication/register.html'
     success_url = reverse_lazy('authentication:login')
     
@@ -106,43 +136,86 @@ class RegisterView(CreateView):
     
     def form_valid(self, form):
         """Handle successful registration"""
-        with transaction.atomic():
-            user = form.save()
-            
-            # Send welcome email
-            self.send_welcome_email(user)
-            
-            # Log registration
-            logger.info(f'New user registered: {user.email}')
-            
-            messages.success(
-                self.request,
-                f'Welcome {user.get_full_name()}! Your account has been created successfully. '
-                'Please log in to continue.'
-            )
-            
-        return super().form_valid(form)
+        # The unique constraint on email is the source of truth; the savepoint
+        # only wraps the INSERT so a duplicate can be reported as a form error.
+        try:
+            with transaction.atomic():
+                self.object = user = form.save()
+        except IntegrityError:
+            if not User.objects.filter(email=form.cleaned_data['email']).exists():
+                raise
+            form.add_error('email', 'A user with this email already exists.')
+            return self.form_invalid(form)
+        
+        # Send welcome email
+        self.send_welcome_email(user)
+        
+        # Log registration
+        logger.info(f'New user registered: {user.email}')
+        
+        messages.success(
+            self.request,
+            f'Welcome {user.get_full_name()}! Your account has been created successfully. '
+            'Please log in to continue.'
+        )
+        
+        # CreateView.form_valid would call form.save() a second time
+        return HttpResponseRedirect(self.get_success_url())
     
     def send_welcome_email(self, user):
-        """Send welcome email to new user"""
-        try:
-            subject = 'Welcome to Bank Statement Analyzer'
-            html_message = render_to_string('authentication/emails/welcome.html', {
-                'user': user,
-                'site_name': 'Bank Statement Analyzer'
-            })
-            plain_message = strip_tags(html_message)
-            
-            send_mail(
-                subject,
-                plain_message,
-                settings.DEFAULT_FROM_EMAIL,
-                [user.email],
-                html_message=html_message,
-                fail_silently=True
-            )
-        except Exception as e:
-            logger.error(f'Failed to send welcome email to {user.email}: {str(e)}')
+        """Queue the welcome email to be sent once the new user is committed"""
+        user_id = user.pk
+        transaction.on_commit(lambda: _email_executor.submit(_send_welcome_email, user_id))
+
+
+def render_welcome_email(user):
+    """
+    Render the welcome email HTML for ``user``
+
+    The template is rendered once with placeholder tokens and cached; each call
+    only substitutes the escaped first name and email into the cached shell.
+    """
+    shell = cache.get_or_set(
+        _WELCOME_EMAIL_SHELL_CACHE_KEY,
+        lambda: render_to_string('authentication/emails/welcome.html', {
+            'first_name': _WELCOME_FIRST_NAME_TOKEN,
+            'email': _WELCOME_EMAIL_TOKEN,
+            'site_name': 'Bank Statement Analyzer'
+        }),
+        3600
+    )
+    return (
+        shell
+        .replace(_WELCOME_FIRST_NAME_TOKEN, escape(user.first_name or user.email))
+        .replace(_WELCOME_EMAIL_TOKEN, escape(user.email))
+    )
+
+
+def _send_welcome_email(user_id):
+    """Send welcome email to new user (runs on the background email pool)"""
+    try:
+        user = User.objects.get(pk=user_id)
+        subject = 'Welcome to Bank Statement Analyzer'
+        html_message = render_welcome_email(user)
+        plain_message = render_to_string('authentication/emails/welcome.txt', {
+            'first_name': user.first_name or user.email,
+            'email': user.email,
+            'site_name': 'Bank Statement Analyzer'
+        })
+        
+        send_mail(
+            subject,
+            plain_message,
+            settings.DEFAULT_FROM_EMAIL,
+            [user.email],
+            html_message=html_message,
+            fail_silently=True
+        )
+    except Exception as e:
+        logger.error(f'Failed to send welcome email to user {user_id}: {str(e)}')
+    finally:
+        # Worker threads hold their own DB connection; don't leak it
+        connection.close()
 
 
 class CustomPasswordResetView(PasswordResetView):
@@ -201,19 +274,11 @@ class ProfileView(DetailView):
     model = User
     template_name = 'authentication/profile.html'
     context_object_name = 'profile_user'
+    # Minimal profile context - no session tracking
+    extra_context = {'recent_logins': [], 'active_sessions': []}
     
     def get_object(self):
         return self.request.user
-    
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        user = self.get_object()
-        
-        # Minimal profile context - no session tracking
-        context['recent_logins'] = []
-        context['active_sessions'] = []
-        
-        return context
 
 
 @method_decorator([login_required, never_cache], name='dispatch')
@@ -232,8 +297,10 @@ class ProfileEditView(UpdateView):
         return reverse_lazy('authentication:profile')
     
     def form_valid(self, form):
+        response = super().form_valid(form)
+        self.request.session['full_name'] = self.object.get_full_name() or self.object.username
         messages.success(self.request, 'Your profile has been updated successfully.')
-        return super().form_valid(form)
+        return response
 
 
 @login_required
@@ -260,8 +327,7 @@ def terminate_session(request, session_id):
     """
     Session termination not available in minimal setup
     """
-    messages.info(request, 'Session management not available in minimal setup.')
-    return redirect('authentication:profile')
+    return HttpResponseRedirect(reverse('authentication:profile') + '?notice=sessions-unavailable')
 
 
 @login_required
@@ -269,13 +335,14 @@ def terminate_all_sessions(request):
     """
     Session termination not available in minimal setup
     """
-    messages.info(request, 'Session management not available in minimal setup.')
-    return redirect('authentication:profile')
+    return HttpResponseRedirect(reverse('authentication:profile') + '?notice=sessions-unavailable')
 
 
 def check_username_availability(request):
     """
     AJAX view to check username availability
+
+    Clients are expected to debounce calls (~300ms) while the user types.
     """
     username = request.GET.get('username', '')
     
@@ -285,7 +352,7 @@ def check_username_availability(request):
             'message': 'Username must be at least 3 characters long.'
         })
     
-    is_available = not User.objects.filter(username=username).exists()
+    is_available = not User.objects.exists_by('username__iexact', username.lower())
     
     return JsonResponse({
         'available': is_available,
@@ -296,6 +363,8 @@ def check_username_availability(request):
 def check_email_availability(request):
     """
     AJAX view to check email availability
+
+    Clients are expected to debounce calls (~300ms) while the user types.
     """
     email = request.GET.get('email', '')
     user_id = request.GET.get('user_id', None)
@@ -306,11 +375,26 @@ def check_email_availability(request):
             'message': 'Email is required.'
         })
     
-    query = User.objects.filter(email=email)
-    if user_id:
-        query = query.exclude(id=user_id)
+    if not _EMAIL_RE.match(email):
+        return JsonResponse({
+            'available': False,
+            'message': 'Enter a valid email address.'
+        })
     
-    is_available = not query.exists()
+    # A user re-checking their own unchanged email needs no query
+    if (request.user.is_authenticated and user_id == str(request.user.pk)
+            and email == request.user.email):
+        return JsonResponse({
+            'available': True,
+            'message': 'Email is available.'
+        })
+
+    if user_id:
+        # Keep this an EXISTS probe; never len()/list() the queryset here
+        query = User.objects.filter(email=email).exclude(id=user_id).values('pk')
+        is_available = not query.exists()
+    else:
+        is_available = not User.objects.exists_by('email', email)
     
     return JsonResponse({
         'available': is_available,
@@ -1,10 +1,38 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.forms.models import BaseInlineFormSet
+from django.db import connections
+from django.db.models import Count, Sum
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from .models import Statement, Transaction, ProcessingLog
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses PostgreSQL's planner row estimate instead of COUNT(*)
+    for unfiltered changelists of large tables
+    """
+    estimate_threshold = 10000  # below this, an exact COUNT(*) is cheap enough
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+        return super().count
+
+
 @admin.register(Statement)
 class StatementAdmin(admin.ModelAdmin):
     list_display = [
@@ -19,9 +47,12 @@ class StatementAdmin(admin.ModelAdmin):
         'user__username', 'user__email', 'original_filename', 
         'account_number'
     ]
+    autocomplete_fields = ['user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = [
         'file_size', 'upload_date', 'updated_at', 
-        'processing_started_at', 'processing_completed_at',
+        'processing_started_at', 'processing_completed_at', 'key_id',
         'transaction_count', 'total_debits', 'total_credits'
     ]
     fieldsets = (
@@ -35,7 +66,7 @@ class StatementAdmin(admin.ModelAdmin):
             'fields': ('processing_status', 'processing_started_at', 'processing_completed_at', 'processing_error')
         }),
         ('Security', {
-            'fields': ('is_encrypted', 'encryption_key'),
+            'fields': ('is_encrypted', 'key_id'),
             'classes': ('collapse',)
         }),
         ('Statistics', {
@@ -55,19 +86,43 @@ class StatementAdmin(admin.ModelAdmin):
             return format_html('<a href="{}">{} transactions</a>', url, count)
         return '0 transactions'
     transaction_count.short_description = 'Transactions'
+    transaction_count.admin_order_field = '_txn_count'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user')
+        # Only one multi-valued join, so the count and sums aren't cross-multiplied
+        return super().get_queryset(request).select_related('user').annotate(
+            _txn_count=Count('transactions'),
+            _debits=Sum('transactions__debit_amount'),
+            _credits=Sum('transactions__credit_amount')
+        )
+
+
+class RecentTransactionFormSet(BaseInlineFormSet):
+    """Inline formset that only loads a statement's most recent transactions"""
+    max_rows = 50
+    
+    def get_queryset(self):
+        # Slice after the parent filter; the full list is on the Transaction changelist
+        if not hasattr(self, '_queryset'):
+            self._queryset = self.queryset.order_by('-transaction_date', '-extracted_at')[:self.max_rows]
+        return self._queryset
 
 
 class TransactionInline(admin.TabularInline):
     model = Transaction
+    formset = RecentTransactionFormSet
+    verbose_name_plural = 'Recent transactions'
     extra = 0
-    readonly_fields = ['extracted_at', 'updated_at']
+    can_delete = False
+    show_change_link = True
     fields = [
         'transaction_date', 'description', 'debit_amount', 
         'credit_amount', 'balance', 'category', 'is_verified'
     ]
+    readonly_fields = fields
+    
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Transaction)
@@ -81,12 +136,13 @@ class TransactionAdmin(admin.ModelAdmin):
         'transaction_date', 'extracted_at'
     ]
     search_fields = [
-        'description', 'raw_description', 'reference_number',
-        'statement__user__username'
+        '^reference_number', '=statement__user__username', 'description'
     ]
     readonly_fields = [
-        'extracted_at', 'updated_at', 'confidence_score'
+        'extracted_at', 'updated_at', 'confidence_score', 'transaction_type'
     ]
+    list_select_related = ('statement', 'statement__user')
+    autocomplete_fields = ['statement']
     fieldsets = (
         ('Transaction Details', {
             'fields': (
@@ -122,7 +178,13 @@ class TransactionAdmin(admin.ModelAdmin):
     description_short.short_description = 'Description'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('statement', 'statement__user')
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            # Nothing on the changelist reads the raw OCR text, so leave it in the DB.
+            # description stays: __str__ (the action checkbox label) needs it.
+            queryset = queryset.defer('raw_description')
+        return queryset
 
 
 @admin.register(ProcessingLog)
@@ -133,6 +195,8 @@ class ProcessingLogAdmin(admin.ModelAdmin):
     list_filter = ['level', 'timestamp']
     search_fields = ['message', 'statement__original_filename']
     readonly_fields = ['timestamp']
+    list_select_related = ('statement',)
+    autocomplete_fields = ['statement']
     
     def statement_link(self, obj):
         url = reverse('admin:bank_statement_statement_change', args=[obj.statement.id])
@@ -142,9 +206,6 @@ class ProcessingLogAdmin(admin.ModelAdmin):
     def message_short(self, obj):
         return obj.message[:100] + '...' if len(obj.message) > 100 else obj.message
     message_short.short_description = 'Message'
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('statement')
 
 
 # Add inline to Statement admin
@@ -1,12 +1,17 @@
 from django import forms
 from django.core.validators import FileExtensionValidator
-from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Field, Fieldset, Div, HTML, Submit
 from crispy_forms.bootstrap import FormActions
+from hello_django.forms import LazyFormHelperMixin
 from .models import Statement, Transaction
+import os
 
+_ALLOWED_EXTENSIONS = ('pdf', 'jpg', 'jpeg', 'png', 'tiff')
+_ALLOWED_EXTENSION_SET = frozenset(_ALLOWED_EXTENSIONS)
+_MAX_UPLOAD_BYTES = 50 << 20  # 50MB
 
-class StatementUploadForm(forms.ModelForm):
+
+class StatementUploadForm(LazyFormHelperMixin, forms.ModelForm):
     """Form for uploading bank statement files with drag-and-drop support"""
     
     class Meta:
@@ -15,7 +20,7 @@ class StatementUploadForm(forms.ModelForm):
         widgets = {
             'file': forms.FileInput(attrs={
                 'class': 'form-control',
-                'accept': '.pdf,.jpg,.jpeg,.png,.tiff',
+                'accept': ','.join(f'.{ext}' for ext in _ALLOWED_EXTENSIONS),
                 'id': 'file-upload'
             }),
             'bank_name': forms.Select(attrs={'class': 'form-select'}),
@@ -33,67 +38,65 @@ class StatementUploadForm(forms.ModelForm):
             })
         }
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.form_enctype = 'multipart/form-data'
-        self.helper.form_class = 'needs-validation'
-        self.helper.attrs = {'novalidate': ''}
-        
-        self.helper.layout = Layout(
-            HTML('''
-                <div class="upload-area" id="upload-area">
-                    <div class="upload-content">
-                        <i class="fas fa-cloud-upload-alt fa-3x text-primary mb-3"></i>
-                        <h5>Drag & Drop your bank statement here</h5>
-                        <p class="text-muted">or click to browse files</p>
-                        <p class="small text-muted">Supported formats: PDF, JPG, PNG, TIFF (Max 50MB)</p>
-                    </div>
+    _HELPER_ATTRS = {
+        'form_method': 'post',
+        'form_enctype': 'multipart/form-data',
+        'form_class': 'needs-validation',
+        'attrs': {'novalidate': ''},
+    }
+    
+    _LAYOUT = Layout(
+        HTML('''
+            <div class="upload-area" id="upload-area">
+                <div class="upload-content">
+                    <i class="fas fa-cloud-upload-alt fa-3x text-primary mb-3"></i>
+                    <h5>Drag & Drop your bank statement here</h5>
+                    <p class="text-muted">or click to browse files</p>
+                    <p class="small text-muted">Supported formats: PDF, JPG, PNG, TIFF (Max 50MB)</p>
                 </div>
-            '''),
-            Field('file', css_class='d-none'),
+            </div>
+        '''),
+        Field('file', css_class='d-none'),
+        Div(
             Div(
-                Div(
-                    Field('bank_name', wrapper_class='mb-3'),
-                    css_class='col-md-6'
-                ),
-                Div(
-                    Field('account_number', wrapper_class='mb-3'),
-                    css_class='col-md-6'
-                ),
-                css_class='row'
+                Field('bank_name', wrapper_class='mb-3'),
+                css_class='col-md-6'
             ),
             Div(
-                Div(
-                    Field('statement_period_start', wrapper_class='mb-3'),
-                    css_class='col-md-6'
-                ),
-                Div(
-                    Field('statement_period_end', wrapper_class='mb-3'),
-                    css_class='col-md-6'
-                ),
-                css_class='row'
+                Field('account_number', wrapper_class='mb-3'),
+                css_class='col-md-6'
             ),
-            FormActions(
-                Submit('submit', 'Upload & Process Statement', css_class='btn btn-primary btn-lg'),
-                css_class='text-center mt-4'
-            )
+            css_class='row'
+        ),
+        Div(
+            Div(
+                Field('statement_period_start', wrapper_class='mb-3'),
+                css_class='col-md-6'
+            ),
+            Div(
+                Field('statement_period_end', wrapper_class='mb-3'),
+                css_class='col-md-6'
+            ),
+            css_class='row'
+        ),
+        FormActions(
+            Submit('submit', 'Upload & Process Statement', css_class='btn btn-primary btn-lg'),
+            css_class='text-center mt-4'
         )
+    )
     
     def clean_file(self):
         file = self.cleaned_data.get('file')
         if file:
             # Check file size (50MB limit)
-            if file.size > 50 * 1024 * 1024:
+            if file.size > _MAX_UPLOAD_BYTES:
                 raise forms.ValidationError('File size cannot exceed 50MB.')
             
             # Check file extension
-            allowed_extensions = ['pdf', 'jpg', 'jpeg', 'png', 'tiff']
-            file_extension = file.name.split('.')[-1].lower()
-            if file_extension not in allowed_extensions:
+            file_extension = os.path.splitext(file.name)[1][1:].lower()
+            if file_extension not in _ALLOWED_EXTENSION_SET:
                 raise forms.ValidationError(
-                    f'Unsupported file format. Allowed formats: {", ".join(allowed_extensions)}'
+                    f'Unsupported file format. Allowed formats: {", ".join(_ALLOWED_EXTENSIONS)}'
                 )
         return file
     
@@ -108,7 +111,11 @@ class StatementUploadForm(forms.ModelForm):
         return cleaned_data
 
 
-class TransactionFilterForm(forms.Form):
+_CATEGORY_CHOICES_WITH_ALL = (('', 'All Categories'),) + tuple(Transaction.CATEGORY_CHOICES)
+_TYPE_CHOICES_WITH_ALL = (('', 'All Types'),) + tuple(Transaction.TRANSACTION_TYPE_CHOICES)
+
+
+class TransactionFilterForm(LazyFormHelperMixin, forms.Form):
     """Form for filtering transactions in the dashboard"""
     
     SORT_CHOICES = [
@@ -130,13 +137,13 @@ class TransactionFilterForm(forms.Form):
     
     category = forms.ChoiceField(
         required=False,
-        choices=[('', 'All Categories')] + Transaction.CATEGORY_CHOICES,
+        choices=_CATEGORY_CHOICES_WITH_ALL,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
     transaction_type = forms.ChoiceField(
         required=False,
-        choices=[('', 'All Types'), ('debit', 'Debit'), ('credit', 'Credit')],
+        choices=_TYPE_CHOICES_WITH_ALL,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
@@ -186,66 +193,61 @@ class TransactionFilterForm(forms.Form):
         widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
     )
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'get'
-        self.helper.form_class = 'filter-form'
-        self.helper.disable_csrf = True
-        
-        self.helper.layout = Layout(
+    _HELPER_ATTRS = {'form_method': 'get', 'form_class': 'filter-form', 'disable_csrf': True}
+    
+    _LAYOUT = Layout(
+        Div(
             Div(
-                Div(
-                    Field('search', wrapper_class='mb-3'),
-                    css_class='col-md-4'
-                ),
-                Div(
-                    Field('category', wrapper_class='mb-3'),
-                    css_class='col-md-2'
-                ),
-                Div(
-                    Field('transaction_type', wrapper_class='mb-3'),
-                    css_class='col-md-2'
-                ),
-                Div(
-                    Field('sort_by', wrapper_class='mb-3'),
-                    css_class='col-md-2'
-                ),
-                Div(
-                    HTML('<label class="form-label">Needs Review</label>'),
-                    Field('needs_review', wrapper_class='form-check'),
-                    css_class='col-md-2'
-                ),
-                css_class='row'
+                Field('search', wrapper_class='mb-3'),
+                css_class='col-md-4'
             ),
             Div(
-                Div(
-                    Field('date_from', wrapper_class='mb-3'),
-                    css_class='col-md-3'
-                ),
-                Div(
-                    Field('date_to', wrapper_class='mb-3'),
-                    css_class='col-md-3'
-                ),
-                Div(
-                    Field('amount_min', wrapper_class='mb-3'),
-                    css_class='col-md-3'
-                ),
-                Div(
-                    Field('amount_max', wrapper_class='mb-3'),
-                    css_class='col-md-3'
-                ),
-                css_class='row'
+                Field('category', wrapper_class='mb-3'),
+                css_class='col-md-2'
             ),
-            FormActions(
-                Submit('filter', 'Apply Filters', css_class='btn btn-primary'),
-                HTML('<a href="?" class="btn btn-outline-secondary ms-2">Clear Filters</a>'),
-                css_class='text-center'
-            )
+            Div(
+                Field('transaction_type', wrapper_class='mb-3'),
+                css_class='col-md-2'
+            ),
+            Div(
+                Field('sort_by', wrapper_class='mb-3'),
+                css_class='col-md-2'
+            ),
+            Div(
+                HTML('<label class="form-label">Needs Review</label>'),
+                Field('needs_review', wrapper_class='form-check'),
+                css_class='col-md-2'
+            ),
+            css_class='row'
+        ),
+        Div(
+            Div(
+                Field('date_from', wrapper_class='mb-3'),
+                css_class='col-md-3'
+            ),
+            Div(
+                Field('date_to', wrapper_class='mb-3'),
+                css_class='col-md-3'
+            ),
+            Div(
+                Field('amount_min', wrapper_class='mb-3'),
+                css_class='col-md-3'
+            ),
+            Div(
+                Field('amount_max', wrapper_class='mb-3'),
+                css_class='col-md-3'
+            ),
+            css_class='row'
+        ),
+        FormActions(
+            Submit('filter', 'Apply Filters', css_class='btn btn-primary'),
+            HTML('<a href="?" class="btn btn-outline-secondary ms-2">Clear Filters</a>'),
+            css_class='text-center'
         )
+    )
 
 
-class TransactionEditForm(forms.ModelForm):
+class TransactionEditForm(LazyFormHelperMixin, forms.ModelForm):
     """Form for editing individual transactions"""
     
     class Meta:
@@ -283,69 +285,66 @@ class TransactionEditForm(forms.ModelForm):
             'is_verified': forms.CheckboxInput(attrs={'class': 'form-check-input'})
         }
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        
-        self.helper.layout = Layout(
-            Fieldset(
-                'Transaction Details',
+    _HELPER_ATTRS = {'form_method': 'post'}
+    
+    _LAYOUT = Layout(
+        Fieldset(
+            'Transaction Details',
+            Div(
                 Div(
-                    Div(
-                        Field('transaction_date', wrapper_class='mb-3'),
-                        css_class='col-md-6'
-                    ),
-                    Div(
-                        Field('reference_number', wrapper_class='mb-3'),
-                        css_class='col-md-6'
-                    ),
-                    css_class='row'
+                    Field('transaction_date', wrapper_class='mb-3'),
+                    css_class='col-md-6'
                 ),
-                Field('description', wrapper_class='mb-3'),
-            ),
-            Fieldset(
-                'Amounts',
                 Div(
-                    Div(
-                        Field('debit_amount', wrapper_class='mb-3'),
-                        css_class='col-md-4'
-                    ),
-                    Div(
-                        Field('credit_amount', wrapper_class='mb-3'),
-                        css_class='col-md-4'
-                    ),
-                    Div(
-                        Field('balance', wrapper_class='mb-3'),
-                        css_class='col-md-4'
-                    ),
-                    css_class='row'
-                )
+                    Field('reference_number', wrapper_class='mb-3'),
+                    css_class='col-md-6'
+                ),
+                css_class='row'
             ),
-            Fieldset(
-                'Categorization',
+            Field('description', wrapper_class='mb-3'),
+        ),
+        Fieldset(
+            'Amounts',
+            Div(
                 Div(
-                    Div(
-                        Field('category', wrapper_class='mb-3'),
-                        css_class='col-md-6'
-                    ),
-                    Div(
-                        HTML('<label class="form-label">Verified</label>'),
-                        Field('is_verified', wrapper_class='form-check'),
-                        css_class='col-md-6'
-                    ),
-                    css_class='row'
-                )
-            ),
-            FormActions(
-                Submit('save', 'Save Changes', css_class='btn btn-primary'),
-                HTML('<a href="{% url \'bank_statement:dashboard\' %}" class="btn btn-outline-secondary ms-2">Cancel</a>'),
-                css_class='text-center mt-4'
+                    Field('debit_amount', wrapper_class='mb-3'),
+                    css_class='col-md-4'
+                ),
+                Div(
+                    Field('credit_amount', wrapper_class='mb-3'),
+                    css_class='col-md-4'
+                ),
+                Div(
+                    Field('balance', wrapper_class='mb-3'),
+                    css_class='col-md-4'
+                ),
+                css_class='row'
+            )
+        ),
+        Fieldset(
+            'Categorization',
+            Div(
+                Div(
+                    Field('category', wrapper_class='mb-3'),
+                    css_class='col-md-6'
+                ),
+                Div(
+                    HTML('<label class="form-label">Verified</label>'),
+                    Field('is_verified', wrapper_class='form-check'),
+                    css_class='col-md-6'
+                ),
+                css_class='row'
             )
+        ),
+        FormActions(
+            Submit('save', 'Save Changes', css_class='btn btn-primary'),
+            HTML('<a href="{% url \'bank_statement:dashboard\' %}" class="btn btn-outline-secondary ms-2">Cancel</a>'),
+            css_class='text-center mt-4'
         )
+    )
 
 
-class ExportForm(forms.Form):
+class ExportForm(LazyFormHelperMixin, forms.Form):
     """Form for exporting transaction data"""
     
     FORMAT_CHOICES = [
@@ -366,21 +365,17 @@ class ExportForm(forms.Form):
         help_text='Include all transactions or only filtered results'
     )
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.helper = FormHelper()
-        self.helper.form_method = 'post'
-        self.helper.form_class = 'export-form'
-        
-        self.helper.layout = Layout(
-            Field('format', wrapper_class='mb-3'),
-            Div(
-                HTML('<label class="form-label">Include All Transactions</label>'),
-                Field('include_all', wrapper_class='form-check'),
-                css_class='mb-3'
-            ),
-            FormActions(
-                Submit('export', 'Export Data', css_class='btn btn-success'),
-                css_class='text-center'
-            )
-        )
\ No newline at end of file
+    _HELPER_ATTRS = {'form_method': 'post', 'form_class': 'export-form'}
+    
+    _LAYOUT = Layout(
+        Field('format', wrapper_class='mb-3'),
+        Div(
+            HTML('<label class="form-label">Include All Transactions</label>'),
+            Field('include_all', wrapper_class='form-check'),
+            css_class='mb-3'
+        ),
+        FormActions(
+            Submit('export', 'Export Data', css_class='btn btn-success'),
+            css_class='text-center'
+        )
+    )
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_statement', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='bank_statem_stateme_e4cb4a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['statement', '-transaction_date', '-extracted_at'], name='txn_stmt_date_ext_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_statement', '0003_transaction_txn_desc_trgm'),
+    ]
+
+    # A plain column can't be altered into a generated one, so drop and re-add
+    # it (and the index that depends on it).
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='bank_statem_transac_e86a2a_idx',
+        ),
+        migrations.RemoveField(
+            model_name='transaction',
+            name='transaction_type',
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='transaction_type',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(debit_amount__gt=0, then=models.Value('debit')), models.When(credit_amount__gt=0, then=models.Value('credit')), default=models.Value('')), output_field=models.CharField(choices=[('debit', 'Debit'), ('credit', 'Credit')], max_length=10)),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['transaction_type'], name='bank_statem_transac_e86a2a_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+import uuid
+from django.db import migrations, models
+
+
+def move_keys_out(apps, schema_editor):
+    Statement = apps.get_model('bank_statement', 'Statement')
+    EncryptionKey = apps.get_model('bank_statement', 'EncryptionKey')
+    for statement in Statement.objects.exclude(encryption_key=None).only('pk', 'encryption_key').iterator():
+        key = EncryptionKey.objects.create(key=bytes(statement.encryption_key))
+        Statement.objects.filter(pk=statement.pk).update(key_id=str(key.pk))
+
+
+def move_keys_back(apps, schema_editor):
+    Statement = apps.get_model('bank_statement', 'Statement')
+    EncryptionKey = apps.get_model('bank_statement', 'EncryptionKey')
+    for statement in Statement.objects.exclude(key_id='').only('pk', 'key_id').iterator():
+        key = EncryptionKey.objects.get(pk=statement.key_id)
+        Statement.objects.filter(pk=statement.pk).update(encryption_key=key.key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank_statement', '0004_transaction_type_generated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EncryptionKey',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('key', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='statement',
+            name='key_id',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.RunPython(move_keys_out, move_keys_back),
+        migrations.RemoveField(
+            model_name='statement',
+            name='encryption_key',
+        ),
+    ]
@@ -1,15 +1,48 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.contrib.auth import get_user_model
 from django.core.validators import FileExtensionValidator
 from cryptography.fernet import Fernet
 from django.conf import settings
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+import hashlib
 import os
+import re
+import uuid
+from functools import lru_cache
+from pathlib import Path
 
 User = get_user_model()
 
 def get_upload_path(instance, filename):
     """Generate secure upload path for bank statement files"""
-    return f'bank_statements/{instance.user.id}/{filename}'
+    # A random per-upload hash keeps same-named files apart, and its leading hex
+    # pairs fan files out so no single directory grows unbounded.
+    digest = hashlib.blake2b(
+        f'{instance.user_id}:{filename}:{uuid.uuid4()}'.encode(), digest_size=8
+    ).hexdigest()
+    return f'bank_statements/{instance.user_id}/{digest[:2]}/{digest[2:4]}/{digest}_{filename}'
+
+
+class EncryptionKey(models.Model):
+    """Per-statement data keys, kept in their own table instead of on Statement rows"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    key = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    @classmethod
+    def create_data_key(cls):
+        """Generate and store a new Fernet key, returning its id"""
+        return str(cls.objects.create(key=Fernet.generate_key()).pk)
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get_key(key_id):
+        """Return the key bytes for ``key_id``; keys never change, so they're cached in-process"""
+        return bytes(EncryptionKey.objects.values_list('key', flat=True).get(pk=key_id))
 
 
 class Statement(models.Model):
@@ -36,7 +69,8 @@ class Statement(models.Model):
         ('other', 'Other'),
     ]
     
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bank_statements')
+    # Covered by the leading column of the (user, upload_date) index
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bank_statements', db_index=False)
     file = models.FileField(
         upload_to=get_upload_path,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'jpg', 'jpeg', 'png', 'tiff'])]
@@ -60,7 +94,7 @@ class Statement(models.Model):
     
     # Encryption fields
     is_encrypted = models.BooleanField(default=True)
-    encryption_key = models.BinaryField(blank=True, null=True)
+    key_id = models.CharField(max_length=64, blank=True)  # EncryptionKey id
     
     class Meta:
         ordering = ['-upload_date']
@@ -88,23 +122,74 @@ class Statement(models.Model):
             else:
                 self.file_type = 'unknown'
         
-        if not self.encryption_key and self.is_encrypted:
+        if not self.key_id and self.is_encrypted:
             # Generate encryption key for this statement
-            key = Fernet.generate_key()
-            self.encryption_key = key
+            self.key_id = EncryptionKey.create_data_key()
         super().save(*args, **kwargs)
     
+    @property
+    def encryption_key(self):
+        return EncryptionKey.get_key(self.key_id) if self.key_id else None
+    
+    def _stats(self):
+        """
+        Transaction count and debit/credit totals, fetched at most once per instance
+        
+        Prefers values annotated onto the queryset (see StatementAdmin.get_queryset);
+        otherwise a single aggregate query computes all three.
+        """
+        if not hasattr(self, '_stats_cache'):
+            if hasattr(self, '_txn_count'):
+                self._stats_cache = {
+                    'count': self._txn_count,
+                    'debits': self._debits,
+                    'credits': self._credits,
+                }
+            else:
+                self._stats_cache = self.transactions.aggregate(
+                    count=models.Count('id'),
+                    debits=models.Sum('debit_amount'),
+                    credits=models.Sum('credit_amount')
+                )
+        return self._stats_cache
+    
     @property
     def transaction_count(self):
-        return self.transactions.count()
+        return self._stats()['count']
     
     @property
     def total_debits(self):
-        return self.transactions.aggregate(total=models.Sum('debit_amount'))['total'] or 0
+        return self._stats()['debits'] or 0
     
     @property
     def total_credits(self):
-        return self.transactions.aggregate(total=models.Sum('credit_amount'))['total'] or 0
+        return self._stats()['credits'] or 0
+
+# Auto-categorization keywords in priority order; the first category with a hit wins
+_CATEGORY_KEYWORDS = [
+    ('atm_withdrawal', ['atm', 'cash withdrawal', 'atm wdl']),
+    ('pos_purchase', ['pos', 'purchase', 'merchant']),
+    ('upi', ['upi', 'paytm', 'gpay', 'phonepe', 'bhim']),
+    ('neft', ['neft']),
+    ('rtgs', ['rtgs']),
+    ('imps', ['imps']),
+    ('salary', ['salary', 'sal cr', 'payroll']),
+    ('interest', ['interest', 'int cr', 'int paid']),
+    ('charges', ['charges', 'fee', 'service charge', 'annual fee']),
+    ('cheque', ['cheque', 'chq', 'check']),
+]
+
+# Every keyword in one alternation, grouped by category name. The zero-width
+# lookahead reports a hit at each position a keyword starts, so one left-to-right
+# scan sees overlapping keywords too; _auto_categorize keeps the highest priority.
+_CATEGORY_RE = re.compile(
+    '(?=' + '|'.join(
+        rf'(?P<{category}>' + '|'.join(map(re.escape, keywords)) + ')'
+        for category, keywords in _CATEGORY_KEYWORDS
+    ) + ')',
+    re.IGNORECASE
+)
+_CATEGORY_PRIORITY = {category: rank for rank, (category, _) in enumerate(_CATEGORY_KEYWORDS)}
 
 
 class Transaction(models.Model):
@@ -131,7 +216,8 @@ class Transaction(models.Model):
         ('other', 'Other'),
     ]
     
-    statement = models.ForeignKey(Statement, on_delete=models.CASCADE, related_name='transactions')
+    # Covered by the leading column of txn_stmt_date_ext_idx
+    statement = models.ForeignKey(Statement, on_delete=models.CASCADE, related_name='transactions', db_index=False)
     
     # Core transaction fields
     transaction_date = models.DateField()
@@ -145,7 +231,16 @@ class Transaction(models.Model):
     balance = models.DecimalField(max_digits=15, decimal_places=2, blank=True, null=True)
     
     # Categorization
-    transaction_type = models.CharField(max_length=10, choices=TRANSACTION_TYPE_CHOICES)
+    # Derived by the database from the amounts (GENERATED ... STORED)
+    transaction_type = models.GeneratedField(
+        expression=models.Case(
+            models.When(debit_amount__gt=0, then=models.Value('debit')),
+            models.When(credit_amount__gt=0, then=models.Value('credit')),
+            default=models.Value(''),
+        ),
+        output_field=models.CharField(max_length=10, choices=TRANSACTION_TYPE_CHOICES),
+        db_persist=True,
+    )
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='other')
     
     # Data quality fields
@@ -161,10 +256,13 @@ class Transaction(models.Model):
     class Meta:
         ordering = ['-transaction_date', '-extracted_at']
         indexes = [
-            models.Index(fields=['statement', 'transaction_date']),
+            models.Index(fields=['statement', '-transaction_date', '-extracted_at'], name='txn_stmt_date_ext_idx'),
             models.Index(fields=['transaction_type']),
             models.Index(fields=['category']),
             models.Index(fields=['needs_review']),
+            # Trigram index for the admin's description__icontains search, which
+            # PostgreSQL compiles to UPPER(description) LIKE UPPER('%q%')
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='txn_desc_trgm'),
         ]
         unique_together = ['statement', 'transaction_date', 'description', 'debit_amount', 'credit_amount']
     
@@ -173,59 +271,24 @@ class Transaction(models.Model):
         return f"{self.transaction_date} - {self.description[:50]} - {amount}"
     
     def save(self, *args, **kwargs):
-        # Auto-determine transaction type based on amounts
-        if self.debit_amount and self.debit_amount > 0:
-            self.transaction_type = 'debit'
-        elif self.credit_amount and self.credit_amount > 0:
-            self.transaction_type = 'credit'
-        
+        self.classify()
+        super().save(*args, **kwargs)
+    
+    def classify(self):
+        """Fill in the category; call before bulk_create, which skips save()"""
         # Auto-categorize based on description
         if not self.category or self.category == 'other':
             self.category = self._auto_categorize()
-        
-        super().save(*args, **kwargs)
     
     def _auto_categorize(self):
         """Auto-categorize transaction based on description"""
-        description_lower = self.description.lower()
-        
-        # ATM withdrawals
-        if any(keyword in description_lower for keyword in ['atm', 'cash withdrawal', 'atm wdl']):
-            return 'atm_withdrawal'
-        
-        # POS purchases
-        if any(keyword in description_lower for keyword in ['pos', 'purchase', 'merchant']):
-            return 'pos_purchase'
-        
-        # UPI transactions
-        if any(keyword in description_lower for keyword in ['upi', 'paytm', 'gpay', 'phonepe', 'bhim']):
-            return 'upi'
-        
-        # NEFT/RTGS/IMPS
-        if 'neft' in description_lower:
-            return 'neft'
-        if 'rtgs' in description_lower:
-            return 'rtgs'
-        if 'imps' in description_lower:
-            return 'imps'
-        
-        # Salary
-        if any(keyword in description_lower for keyword in ['salary', 'sal cr', 'payroll']):
-            return 'salary'
-        
-        # Interest
-        if any(keyword in description_lower for keyword in ['interest', 'int cr', 'int paid']):
-            return 'interest'
-        
-        # Bank charges
-        if any(keyword in description_lower for keyword in ['charges', 'fee', 'service charge', 'annual fee']):
-            return 'charges'
-        
-        # Cheque
-        if any(keyword in description_lower for keyword in ['cheque', 'chq', 'check']):
-            return 'cheque'
-        
-        return 'other'
+        best = None
+        for match in _CATEGORY_RE.finditer(self.description):
+            if best is None or _CATEGORY_PRIORITY[match.lastgroup] < _CATEGORY_PRIORITY[best]:
+                best = match.lastgroup
+                if _CATEGORY_PRIORITY[best] == 0:
+                    break
+        return best or 'other'
     
     @property
     def amount(self):
@@ -257,3 +320,15 @@ class ProcessingLog(models.Model):
     
     def __str__(self):
         return f"{self.statement} - {self.level} - {self.message[:50]}"
+
+
+@receiver(post_delete, sender=Statement)
+def delete_statement_extraction_cache(sender, instance, **kwargs):
+    """Drop the statement's cached extraction results (see BankStatementProcessor._cache_path)"""
+    cache_dir = getattr(settings, 'STATEMENT_CACHE_DIR', None)
+    if not cache_dir:
+        return
+    for path in Path(cache_dir).glob(f'v*-{instance.pk}-*'):
+        # v<version>-<statement pk>-<sha256>...; the glob alone can't pin the pk field
+        if path.name.split('-')[1] == str(instance.pk):
+            path.unlink(missing_ok=True)
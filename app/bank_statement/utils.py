@@ -1,12 +1,23 @@
 import os
 import io
+import calendar
 import re
+import json
+import hashlib
 import pandas as pd
 import numpy as np
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from typing import List, Dict, Tuple, Optional, Union
 import logging
+import multiprocessing
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
 
 # OCR and PDF processing imports
 try:
@@ -16,6 +27,16 @@ except ImportError:
     pytesseract = None
     Image = None
 
+try:
+    import cv2  # opencv-python-headless, installed alongside camelot
+except ImportError:
+    cv2 = None
+
+try:
+    import tesserocr  # in-process Tesseract API, avoids a CLI subprocess per call
+except ImportError:
+    tesserocr = None
+
 try:
     import pdfplumber
 except ImportError:
@@ -36,11 +57,402 @@ try:
 except ImportError:
     tabula = None
 
+try:
+    import re2  # google-re2: linear-time DFA matching, no backtracking
+except ImportError:
+    re2 = None
+
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:
+    MinHash = MinHashLSH = None
+
+import django
+from cryptography.fernet import Fernet, InvalidToken
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from .models import ProcessingLog
 
 logger = logging.getLogger(__name__)
 
+# Line-parsing patterns, compiled once at import for the text-parsing hot path.
+# They avoid backreferences and lookarounds so RE2 can run them when available.
+
+
+class _LinePattern:
+    """
+    A line-parsing pattern compiled with stdlib re, and with RE2 when installed.
+    RE2's \\d, \\w and \\b are ASCII-only, so only ASCII text goes to RE2; other
+    text stays on re and matches exactly as it would without RE2.
+    """
+    __slots__ = ('re', 're2')
+    
+    def __init__(self, pattern: str):
+        self.re = re.compile(pattern)
+        self.re2 = re2.compile(pattern) if re2 is not None else None
+    
+    def for_text(self, text: str):
+        """Compiled pattern to run on text"""
+        return self.re2 if self.re2 is not None and text.isascii() else self.re
+
+
+_LINE_PATTERN_SOURCES = (
+    # DD/MM/YYYY Description Amount Balance
+    r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+(\d+[.,]\d{2})\s+(\d+[.,]\d{2})$',
+    # DD/MM/YYYY Description Debit Credit Balance
+    r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+(\d+[.,]\d{2})?\s+(\d+[.,]\d{2})?\s+(\d+[.,]\d{2})$',
+    # More flexible pattern
+    r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+([\d,]+[.]\d{2}).*?([\d,]+[.]\d{2})$',
+)
+_LINE_PATTERNS = tuple(_LinePattern(p) for p in _LINE_PATTERN_SOURCES)
+if re2 is not None:
+    # One DFA pass tells which of the line patterns match at all
+    _LINE_PATTERN_SET = re2.Set.SearchSet()
+    for _source in _LINE_PATTERN_SOURCES:
+        _LINE_PATTERN_SET.Add(_source)
+    _LINE_PATTERN_SET.Compile()
+else:
+    _LINE_PATTERN_SET = None
+
+# One or two leading dates (often Hijri + Gregorian) in a single anchored match
+_LEADING_DATES_RE = _LinePattern(
+    r"^\s*(?P<d1>\d{1,2}[\/-]\d{1,2}[\/-]\d{2,4})(?:\s+(?P<d2>\d{1,2}[\/-]\d{1,2}[\/-]\d{2,4}))?\b"
+)
+# Decimal numbers (with optional thousands separators) — amounts typically have .dd
+_AMOUNT_RE = _LinePattern(r"[-+]?\d{1,3}(?:,\d{3})*(?:\.\d{2})|[-+]?\d+\.\d{2}")
+# Trailing date-time like '05-03- 2025 09:27:30 PM'
+_TAIL_DT_RE = _LinePattern(r"(?i)(\d{1,2}[\/-]\d{1,2}[\/-]\s*\d{2,4}\s+\d{1,2}:\d{2}:\d{2}\s*(?:AM|PM)?)\s*$")
+# Common date shapes, parsed without strptime; _parse_date falls back to its
+# format loop when none of these match
+_DATE_SHAPES_RE = re.compile(
+    r"(?P<d>[0-9]{1,2})(?P<sep>[/.-])(?P<m>[0-9]{1,2})(?P=sep)(?P<y>[0-9]{4}|[0-9]{2})"
+    r"|(?P<iso_y>[0-9]{4})(?P<iso_sep>[/-])(?P<iso_m>[0-9]{1,2})(?P=iso_sep)(?P<iso_d>[0-9]{1,2})"
+    r"|(?P<dn_d>[0-9]{1,2})\s+(?P<dn_month>[A-Za-z]+)\s+(?P<dn_y>[0-9]{4})"
+    r"|(?P<nd_month>[A-Za-z]+)\s+(?P<nd_d>[0-9]{1,2}),\s+(?P<nd_y>[0-9]{4})"
+)
+# Month names/abbreviations as strptime's %B/%b see them
+_MONTH_NUMBERS = {
+    **{name.lower(): number for number, name in enumerate(calendar.month_abbr) if name},
+    **{name.lower(): number for number, name in enumerate(calendar.month_name) if name},
+}
+# strptime formats tried in order when a date matches none of _DATE_SHAPES_RE
+_DATE_FORMATS: Tuple[str, ...] = (
+    '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y',
+    '%d/%m/%y', '%d-%m-%y', '%d.%m.%y',
+    '%Y-%m-%d', '%Y/%m/%d',
+    '%m/%d/%Y', '%m-%d-%Y',
+    '%d %b %Y', '%d %B %Y',
+    '%b %d, %Y', '%B %d, %Y',
+)
+# Cell values (lowercased) that mean "no value" for the date/amount parsers
+_EMPTY_TOKENS = frozenset({'nan', 'none', ''})
+
+
+class _AmountCharTable(dict):
+    """
+    str.translate table for amount cells: keeps decimal digits (any script, as
+    re's \\d does; Decimal reads them) plus '.', ',' and '-', and drops everything
+    else. Codepoints are classified on first sight and remembered, up to
+    max_size of them so odd input cannot grow the table without bound.
+    """
+    kept_punctuation = '.,-'
+    max_size = 4096
+    
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char.isdecimal() or char in self.kept_punctuation:
+            value = char
+        else:
+            value = None
+        if len(self) < self.max_size:
+            self[codepoint] = value
+        return value
+
+
+_AMOUNT_CHARS = _AmountCharTable()
+
+# Stays on stdlib re so Unicode whitespace is folded before the RE2 scanners run
+_WHITESPACE_RE = re.compile(r"\s+")
+_HEADER_NOISE_RE = _LinePattern(r"(?i)^(date|transaction|description|narration|debit|credit|amount|balance|page\s+\d+|statement|account|opening balance|closing balance)\b")
+_SEP_NOISE_RE = _LinePattern(r"^[\-=_]{4,}$")
+# Date at line start indicates a new transaction candidate; multiline so one
+# scan over the joined buffer finds every such line
+_DATE_START_RE = _LinePattern(
+    r"(?m)^(\d{1,2}[\/-]\d{1,2}[\/-]\d{2,4}|\d{4}[\/-]\d{2}[\/-]\d{2}|\d{1,2}\s+[A-Za-z]{3,}\s+\d{2,4}|[A-Za-z]{3}\s+\d{1,2},\s*\d{2,4})\b"
+)
+
+
+def _word_tokens(words: List[Dict]) -> List[str]:
+    """Lowercased, stripped, non-empty 'text' values of word objects, in the given order"""
+    return [text for text in (str(w.get('text', '')).strip().lower() for w in words) if text]
+
+
+def _token_ngrams(toks: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Unigrams, bigrams and trigrams of toks; the n-gram at index i starts at token i"""
+    bigrams = [f"{a} {b}" for a, b in zip(toks, toks[1:])]
+    trigrams = [f"{a} {b} {c}" for a, b, c in zip(toks, toks[1:], toks[2:])]
+    return toks, bigrams, trigrams
+
+
+@lru_cache(maxsize=32)
+def _match_column(columns: Tuple[str, ...], keywords: Tuple[str, ...]) -> Optional[int]:
+    """Index of the first column whose lowercased name contains a keyword; cached per table schema"""
+    for index, name in enumerate(columns):
+        name = name.lower()
+        if any(keyword in name for keyword in keywords):
+            return index
+    return None
+
+
+# Statements repeat the same date and amount cells on many rows; both parsers
+# are pure functions of the raw string and return immutable values, so cache them
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[date]:
+    """Parse a date string to a date object, or None when no known format matches"""
+    if not date_str or date_str.lower() in _EMPTY_TOKENS:
+        return None
+    
+    shape = _DATE_SHAPES_RE.fullmatch(date_str.strip())
+    if shape:
+        return _date_from_shape(shape)
+    
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str.strip(), fmt).date()
+        except ValueError:
+            continue
+    
+    return None
+
+
+def _date_from_shape(shape) -> Optional[date]:
+    """Build a date from a _DATE_SHAPES_RE match, trying day-first before month-first like the format list"""
+    groups = shape.groupdict()
+    if groups['d']:
+        day, month, year = int(groups['d']), int(groups['m']), int(groups['y'])
+        if len(groups['y']) == 2:
+            # strptime's %y pivot; no month-first format takes a two-digit year
+            candidates = [(year + 2000 if year <= 68 else year + 1900, month, day)]
+        elif groups['sep'] in '/-':
+            candidates = [(year, month, day), (year, day, month)]
+        else:
+            candidates = [(year, month, day)]
+    elif groups['iso_y']:
+        candidates = [(int(groups['iso_y']), int(groups['iso_m']), int(groups['iso_d']))]
+    else:
+        prefix = 'dn' if groups['dn_d'] else 'nd'
+        month = _MONTH_NUMBERS.get(groups[f'{prefix}_month'].lower())
+        if not month:
+            return None
+        candidates = [(int(groups[f'{prefix}_y']), month, int(groups[f'{prefix}_d']))]
+    
+    for year, month, day in candidates:
+        try:
+            return date(year, month, day)
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_amount_cached(amount_str: str) -> Optional[Decimal]:
+    """Parse an amount string to Decimal, or None when nothing numeric remains"""
+    if not amount_str or amount_str.lower() in _EMPTY_TOKENS:
+        return None
+    
+    # Keep only digits, '.', ',' and '-' in one pass
+    amount_str = str(amount_str).translate(_AMOUNT_CHARS)
+    
+    if not amount_str:
+        return None
+    
+    # Handle different decimal separators
+    if ',' in amount_str and '.' in amount_str:
+        # Assume comma is thousands separator
+        amount_str = amount_str.replace(',', '')
+    elif ',' in amount_str and amount_str.count(',') == 1 and len(amount_str.split(',')[1]) == 2:
+        # Comma as decimal separator
+        amount_str = amount_str.replace(',', '.')
+    
+    try:
+        return Decimal(amount_str)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+_tess_local = threading.local()
+
+
+def _ocr_engine_missing() -> bool:
+    """True when neither tesserocr nor pytesseract (with PIL) can run OCR"""
+    return Image is None or (pytesseract is None and tesserocr is None)
+
+
+def _tess_api(psm: int, lang: str = 'eng'):
+    """Return this thread's PyTessBaseAPI for (lang, psm), initialising it once"""
+    apis = getattr(_tess_local, 'apis', None)
+    if apis is None:
+        apis = _tess_local.apis = {}
+    api = apis.get((lang, psm))
+    if api is None:
+        api = apis[(lang, psm)] = tesserocr.PyTessBaseAPI(lang=lang, psm=psm)
+    return api
+
+
+def _ocr_image(image, config: str) -> Tuple[str, float]:
+    """
+    OCR a PIL image with a '--psm N' config; returns (text, mean word confidence).
+
+    Uses a persistent tesserocr API when installed, else a single pytesseract
+    image_to_data pass whose words are regrouped into lines.
+    """
+    if tesserocr is not None:
+        api = _tess_api(int(config.split()[-1]))
+        api.SetImage(image)
+        return api.GetUTF8Text(), float(api.MeanTextConf())
+    
+    data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+    lines: Dict[Tuple[int, int, int, int], List[str]] = {}
+    confs = []
+    for i, word in enumerate(data.get('text', [])):
+        if not word or not word.strip():
+            continue
+        key = (data['page_num'][i], data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(key, []).append(word)
+        conf = float(data['conf'][i])
+        if conf > 0:
+            confs.append(conf)
+    text = "\n".join(" ".join(words) for words in lines.values())
+    return text, (sum(confs) / len(confs)) if confs else 0.0
+
+
+# Bump whenever extraction/parsing output changes so older cached results are ignored
+_PARSE_CACHE_VERSION = 2
+_CACHED_AMOUNT_FIELDS = ('debit_amount', 'credit_amount', 'balance')
+
+
+def _prune_extraction_cache(cache_dir: Path):
+    """Delete cache entries older than STATEMENT_CACHE_MAX_AGE or written by another cache version"""
+    cutoff = time.time() - settings.STATEMENT_CACHE_MAX_AGE
+    prefix = f"v{_PARSE_CACHE_VERSION}-"
+    for path in cache_dir.iterdir():
+        try:
+            if not path.name.startswith(prefix) or path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            continue  # removed concurrently, or a temp file still being written
+
+# Header keyword synonyms per normalized column name, compiled into literal
+# alternations once so each n-gram is tested with a single search
+_HEADER_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'date': ('date', 'transaction date', 'value date', 'posting date'),
+    'description': ('description', 'narration', 'particulars', 'details', 'transaction details'),
+    'debit': ('debit', 'withdrawal', 'dr', 'debit amount'),
+    'credit': ('credit', 'deposit', 'cr', 'credit amount'),
+    'amount': ('amount', 'transaction amount'),
+    'balance': ('balance', 'closing balance', 'running balance'),
+}
+_HEADER_NAME_RES = tuple(
+    (name, re.compile('|'.join(map(re.escape, kws)))) for name, kws in _HEADER_KEYWORDS.items()
+)
+_ANY_HEADER_KEYWORD_RE = re.compile('|'.join(re.escape(k) for kws in _HEADER_KEYWORDS.values() for k in kws))
+_AMOUNT_COLUMN_KEYWORDS = {name: _HEADER_KEYWORDS[name] for name in ('debit', 'credit', 'balance')}
+# Words that mark a line of pdfplumber words as the table header
+_HEADER_LINE_WORDS = frozenset({'date', 'debit', 'credit', 'balance', 'transaction'})
+
+# Pages whose text layer has at least this many non-whitespace characters skip OCR
+_MIN_TEXT_LAYER_CHARS = 50
+# Upper bound on the render scale; 1.0 == 72 DPI, so 2.0 == 144 DPI
+_MAX_RENDER_SCALE = 2.0
+# ProcessingLog rows are buffered per run and flushed in INSERTs of this size
+_LOG_FLUSH_SIZE = 200
+# Duplicate buckets at least this large use MinHash LSH (when datasketch is
+# installed) to find candidate pairs instead of comparing every pair
+_MINHASH_MIN_BUCKET = 1000
+_MINHASH_NUM_PERM = 64
+
+
+def _text_layer_chars(page) -> int:
+    """Number of non-whitespace characters in a page's extractable text layer"""
+    return sum(not c.isspace() for c in page.get_text("text"))
+
+
+def _render_scale(page) -> float:
+    """Render scale for OCR, never upscaling past the native DPI of the page's scanned images"""
+    dpis = []
+    for info in page.get_image_info():
+        width_pt = info['bbox'][2] - info['bbox'][0]
+        if width_pt > 0 and info.get('width'):
+            dpis.append(info['width'] / (width_pt / 72.0))
+    if not dpis:
+        return _MAX_RENDER_SCALE
+    return min(_MAX_RENDER_SCALE, max(1.0, max(dpis) / 72.0))
+
+
+def _ocr_page(task: Tuple[int, str, float]) -> Tuple[int, str, float, List[str]]:
+    """
+    Render and OCR one page of a scanned PDF; pages that already carry a text
+    layer return it as-is without OCR.
+
+    Module-level so ProcessPoolExecutor can pickle it; the PDF is opened
+    inside the worker because MuPDF documents can't be shared across processes.
+    Stops trying configs once one reaches early_exit_conf.
+    Returns (page_index, best_text, best_confidence, warnings).
+    """
+    page_index, pdf_path, early_exit_conf = task
+    warnings: List[str] = []
+
+    with fitz.open(pdf_path) as doc:
+        page = doc[page_index]
+        if _text_layer_chars(page) >= _MIN_TEXT_LAYER_CHARS:
+            return page_index, page.get_text("text"), 100.0, warnings
+
+        # Upscale (at most 2x) for better OCR quality
+        scale = _render_scale(page)
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale))
+
+        if cv2 is not None:
+            # Grayscale + threshold straight off the pixmap buffer, no PIL round trip
+            arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+            if pix.n == 1:
+                gray = arr[:, :, 0]
+            else:
+                gray = cv2.cvtColor(arr, cv2.COLOR_RGBA2GRAY if pix.n == 4 else cv2.COLOR_RGB2GRAY)
+            # Simple binarization to reduce noise (>= 180 becomes white)
+            _, bw_arr = cv2.threshold(gray, 179, 255, cv2.THRESH_BINARY)
+            bw = Image.fromarray(bw_arr)
+        else:
+            mode = "RGB" if pix.alpha == 0 else "RGBA"
+            try:
+                image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+            except Exception:
+                # Fallback: use PNG bytes
+                image = Image.open(io.BytesIO(pix.tobytes()))
+
+            # Convert to RGB (remove alpha) and enhance contrast via grayscale + threshold
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            gray = image.convert("L")
+            # Simple binarization to reduce noise
+            bw = gray.point(lambda x: 0 if x < 180 else 255, '1')
+
+    configs = ['--psm 6', '--psm 4', '--psm 3']
+    best_text = ""
+    best_conf = 0.0
+    for cfg in configs:
+        try:
+            text, avg_conf = _ocr_image(bw, cfg)
+            if avg_conf > best_conf and text and text.strip():
+                best_conf = avg_conf
+                best_text = text
+        except Exception as e:
+            warnings.append(f"OCR failed on page {page_index+1} cfg {cfg}: {e}")
+            continue
+        if best_conf >= early_exit_conf:
+            break
+
+    return page_index, best_text, best_conf, warnings
+
 
 class BankStatementProcessor:
     """Main class for processing bank statements from PDF and image files"""
@@ -49,17 +461,91 @@ class BankStatementProcessor:
         self.statement = statement_instance
         self.file_path = statement_instance.file.path
         self.file_type = statement_instance.file_type
+        self._log_buffer: List[ProcessingLog] = []
+        
+    def process(self, force_refresh: bool = False) -> List[Dict]:
+        """
+        Main processing method that routes to appropriate processor.
         
-    def process(self) -> List[Dict]:
-        """Main processing method that routes to appropriate processor"""
+        Results are cached per statement and file SHA-256 in STATEMENT_CACHE_DIR
+        (Fernet-encrypted with the statement's key when it is encrypted);
+        force_refresh=True ignores (and overwrites) any cached result.
+        """
         try:
+            cache_path = self._cache_path()
+            if cache_path and not force_refresh:
+                cached = self._load_cached(cache_path)
+                if cached is not None:
+                    self._log_info(f"Using cached extraction result ({len(cached)} transactions)")
+                    return cached
+            
             if self.file_type == 'pdf':
-                return self._process_pdf()
+                transactions = self._process_pdf()
             else:
-                return self._process_image()
+                transactions = self._process_image()
+            
+            if cache_path and transactions:
+                self._store_cached(cache_path, transactions)
+            return transactions
         except Exception as e:
             self._log_error(f"Processing failed: {str(e)}")
             raise
+        finally:
+            self._flush_logs()
+    
+    def _cache_path(self) -> Optional[Path]:
+        """
+        Cache file for this statement's content, or None when caching is disabled
+        
+        Named v<version>-<statement pk>-<sha256>; delete_statement_extraction_cache
+        relies on the pk being the second field.
+        """
+        cache_dir = getattr(settings, 'STATEMENT_CACHE_DIR', None)
+        if not cache_dir or (self.statement.is_encrypted and not self.statement.key_id):
+            return None
+        with open(self.file_path, 'rb') as f:
+            digest = hashlib.file_digest(f, 'sha256').hexdigest()
+        suffix = 'json.enc' if self.statement.is_encrypted else 'json'
+        return Path(cache_dir) / f"v{_PARSE_CACHE_VERSION}-{self.statement.pk}-{digest}.{suffix}"
+    
+    def _load_cached(self, cache_path: Path) -> Optional[List[Dict]]:
+        """Read cached transactions back into dates/Decimals; None on a miss, expired or unreadable entry"""
+        try:
+            if time.time() - cache_path.stat().st_mtime > settings.STATEMENT_CACHE_MAX_AGE:
+                cache_path.unlink(missing_ok=True)
+                return None
+            payload = cache_path.read_bytes()
+            if self.statement.is_encrypted:
+                payload = Fernet(self.statement.encryption_key).decrypt(payload)
+            transactions = json.loads(payload)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, InvalidToken) as e:
+            self._log_warning(f"Ignoring unreadable extraction cache {cache_path.name}: {e!r}")
+            return None
+        
+        for tx in transactions:
+            tx['transaction_date'] = date.fromisoformat(tx['transaction_date'])
+            for field in _CACHED_AMOUNT_FIELDS:
+                if tx.get(field) is not None:
+                    tx[field] = Decimal(tx[field])
+        return transactions
+    
+    def _store_cached(self, cache_path: Path, transactions: List[Dict]):
+        """Write transactions to the cache atomically and prune stale entries; failures only log a warning"""
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            payload = json.dumps(transactions, cls=DjangoJSONEncoder).encode('utf-8')
+            if self.statement.is_encrypted:
+                payload = Fernet(self.statement.encryption_key).encrypt(payload)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            self._log_warning(f"Could not write extraction cache: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        _prune_extraction_cache(cache_path.parent)
     
     def _process_pdf(self) -> List[Dict]:
         """Process PDF files using multiple extraction methods"""
@@ -92,13 +578,19 @@ class BankStatementProcessor:
                     continue
                 if method.__name__ == '_extract_with_tabula' and tabula is None:
                     continue
-                if method.__name__ == '_extract_scanned_pdf' and (pytesseract is None or Image is None or fitz is None):
+                if method.__name__ == '_extract_scanned_pdf' and (_ocr_engine_missing() or fitz is None):
                     continue
                     
                 self._log_info(f"Trying {method.__name__}")
                 transactions = method()
                 if transactions:
                     self._log_info(f"Successfully extracted {len(transactions)} transactions using {method.__name__}")
+                    if pdf_type == 'mixed' and method != self._extract_scanned_pdf and not _ocr_engine_missing():
+                        # Text methods see nothing on scanned pages; OCR just those and merge
+                        try:
+                            transactions.extend(self._ocr_image_only_pages())
+                        except Exception as e:
+                            self._log_warning(f"OCR of image-only pages failed: {str(e)}")
                     return transactions
             except Exception as e:
                 self._log_warning(f"{method.__name__} failed: {str(e)}")
@@ -108,7 +600,7 @@ class BankStatementProcessor:
     
     def _process_image(self) -> List[Dict]:
         """Process image files using OCR"""
-        if pytesseract is None or Image is None:
+        if _ocr_engine_missing():
             raise Exception("OCR libraries not available")
         
         self._log_info("Starting image OCR processing")
@@ -130,14 +622,12 @@ class BankStatementProcessor:
             
             best_text = ""
             best_confidence = 0
+            # Good enough to stop trying further segmentation modes
+            early_exit_conf = getattr(settings, 'OCR_EARLY_EXIT_CONFIDENCE', 85.0)
             
             for config in configs:
                 try:
-                    text = pytesseract.image_to_string(image, config=config)
-                    # Get confidence data
-                    data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
-                    confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-                    avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+                    text, avg_confidence = _ocr_image(image, config)
                     
                     if avg_confidence > best_confidence:
                         best_confidence = avg_confidence
@@ -146,6 +636,9 @@ class BankStatementProcessor:
                 except Exception as e:
                     self._log_warning(f"OCR config {config} failed: {str(e)}")
                     continue
+                
+                if best_confidence >= early_exit_conf:
+                    break
             
             if not best_text.strip():
                 raise Exception("No text extracted from image")
@@ -207,72 +700,67 @@ class BankStatementProcessor:
 
     def _extract_scanned_pdf(self) -> List[Dict]:
         """OCR extraction for scanned PDFs by rendering pages to images and parsing text."""
-        if fitz is None or pytesseract is None or Image is None:
+        if fitz is None or _ocr_engine_missing():
             raise Exception("Scanned PDF OCR dependencies not available")
 
         self._log_info("Attempting scanned PDF OCR extraction")
 
         try:
-            doc = fitz.open(self.file_path)
+            with fitz.open(self.file_path) as doc:
+                page_count = doc.page_count
         except Exception as e:
             raise Exception(f"Failed to open PDF for OCR: {e}")
 
-        full_text_parts: List[str] = []
-        page_confidences: List[float] = []
-
-        try:
-            for page_index in range(doc.page_count):
-                page = doc[page_index]
-                # Render with 2x scaling for better OCR quality
-                matrix = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=matrix)
-
-                mode = "RGB" if pix.alpha == 0 else "RGBA"
-                try:
-                    image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
-                except Exception:
-                    # Fallback: use PNG bytes
-                    image = Image.open(io.BytesIO(pix.tobytes()))
-
-                # Convert to RGB (remove alpha) and enhance contrast via grayscale + threshold
-                if image.mode not in ("RGB", "L"):
-                    image = image.convert("RGB")
-                gray = image.convert("L")
-                # Simple binarization to reduce noise
-                bw = gray.point(lambda x: 0 if x < 180 else 255, '1')
-
-                configs = ['--psm 6', '--psm 4', '--psm 3']
-                best_text = ""
-                best_conf = 0.0
-                for cfg in configs:
-                    try:
-                        text = pytesseract.image_to_string(bw, config=cfg)
-                        data = pytesseract.image_to_data(bw, config=cfg, output_type=pytesseract.Output.DICT)
-                        confs = [int(c) for c in data.get('conf', []) if str(c).isdigit() and int(c) >= 0]
-                        avg_conf = (sum(confs) / len(confs)) if confs else 0.0
-                        if avg_conf > best_conf and text and text.strip():
-                            best_conf = avg_conf
-                            best_text = text
-                    except Exception as e:
-                        self._log_warning(f"OCR failed on page {page_index+1} cfg {cfg}: {e}")
-                        continue
-
-                if best_text.strip():
-                    full_text_parts.append(best_text)
-                    page_confidences.append(best_conf)
-                else:
-                    self._log_warning(f"No OCR text found on page {page_index+1}")
-
-        finally:
-            doc.close()
-
-        combined_text = "\n\n".join(full_text_parts)
+        combined_text, avg_conf_overall = self._ocr_specific_pages(range(page_count))
         if not combined_text.strip():
             raise Exception("OCR produced no text from scanned PDF")
 
-        avg_conf_overall = (sum(page_confidences) / len(page_confidences)) if page_confidences else 0.0
         self._log_info(f"OCR text extracted from scanned PDF. Avg confidence: {avg_conf_overall:.2f}%")
         return self._parse_text_to_transactions(combined_text, avg_conf_overall)
+
+    def _ocr_image_only_pages(self) -> List[Dict]:
+        """Transactions from pages without a text layer, to merge into a text-based extraction"""
+        with fitz.open(self.file_path) as doc:
+            image_pages = [page.number for page in doc if _text_layer_chars(page) < _MIN_TEXT_LAYER_CHARS]
+        if not image_pages:
+            return []
+
+        self._log_info(f"OCR on {len(image_pages)} image-only page(s)")
+        combined_text, avg_conf = self._ocr_specific_pages(image_pages)
+        return self._parse_text_to_transactions(combined_text, avg_conf)
+
+    def _ocr_specific_pages(self, page_indices) -> Tuple[str, float]:
+        """OCR the given pages concurrently and return (combined_text, average_confidence)"""
+        page_indices = list(page_indices)
+        full_text_parts: List[str] = []
+        page_confidences: List[float] = []
+
+        # Each worker opens its own document
+        early_exit_conf = getattr(settings, 'OCR_EARLY_EXIT_CONFIDENCE', 85.0)
+        tasks = [(page_index, self.file_path, early_exit_conf) for page_index in page_indices]
+        if len(tasks) > 1:
+            # Spawned, not forked: a fork would copy locks held by other threads of
+            # this worker (e.g. the email executor) into children that can never release them
+            with ProcessPoolExecutor(
+                max_workers=min(len(tasks), os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            ) as pool:
+                results = list(pool.map(_ocr_page, tasks))
+        else:
+            results = [_ocr_page(task) for task in tasks]
+
+        for page_index, best_text, best_conf, warnings in results:
+            for warning in warnings:
+                self._log_warning(warning)
+            if best_text.strip():
+                full_text_parts.append(best_text)
+                page_confidences.append(best_conf)
+            else:
+                self._log_warning(f"No OCR text found on page {page_index+1}")
+
+        avg_conf = (sum(page_confidences) / len(page_confidences)) if page_confidences else 0.0
+        return "\n\n".join(full_text_parts), avg_conf
     
     def _extract_with_camelot(self) -> List[Dict]:
         """Extract tables using Camelot"""
@@ -310,7 +798,8 @@ class BankStatementProcessor:
         """Parse DataFrame to transactions"""
         transactions = []
         
-        # Identify key columns
+        # Identify key columns by position, so duplicate header names can't
+        # turn a column lookup into a DataFrame
         date_col = self._find_date_column(df)
         desc_col = self._find_description_column(df)
         debit_col = self._find_amount_column(df, 'debit')
@@ -318,31 +807,54 @@ class BankStatementProcessor:
         balance_col = self._find_amount_column(df, 'balance')
         
         # Require at least date and description columns
-        if not date_col or not desc_col:
+        if date_col is None or desc_col is None:
             return transactions
         
-        # Parse each row into a transaction
-        for _, row in df.iterrows():
-            tx = self._parse_row_to_transaction(row, date_col, desc_col, debit_col, credit_col, balance_col)
-            if tx:
-                transactions.append(tx)
+        def positive_amount(value):
+            amount = self._parse_amount(value)
+            return amount if amount is not None and amount > 0 else None
+        
+        def parse_column(col, parser) -> List:
+            # Parse each distinct cell once; statement columns repeat dates and amounts a lot
+            if col is None:
+                return [None] * len(df)
+            values = [str(v) for v in df.iloc[:, col].tolist()]
+            parsed = {value: parser(value) for value in set(values)}
+            return [parsed[value] for value in values]
+        
+        dates = parse_column(date_col, self._parse_date)
+        descriptions = [str(v).strip() for v in df.iloc[:, desc_col].tolist()]
+        debits = parse_column(debit_col, positive_amount)
+        credits = parse_column(credit_col, positive_amount)
+        balances = parse_column(balance_col, self._parse_amount)
+        raw_descriptions = [' '.join(map(str, row)) for row in df.itertuples(index=False, name=None)]
+        
+        for transaction_date, description, debit_amount, credit_amount, balance, raw_description in zip(
+            dates, descriptions, debits, credits, balances, raw_descriptions
+        ):
+            if not transaction_date or not description or description == 'nan':
+                continue
+            transactions.append({
+                'transaction_date': transaction_date,
+                'description': description,
+                'raw_description': raw_description,
+                'debit_amount': debit_amount,
+                'credit_amount': credit_amount,
+                'balance': balance,
+                'confidence_score': 1.0
+            })
         
         return transactions
     
     def _parse_line_to_transaction(self, line: str, confidence: float = 100.0) -> Optional[Dict]:
         """Parse a single line to transaction"""
-        # Common patterns for bank statement lines
-        patterns = [
-            # DD/MM/YYYY Description Amount Balance
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+(\d+[.,]\d{2})\s+(\d+[.,]\d{2})$',
-            # DD/MM/YYYY Description Debit Credit Balance
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+(\d+[.,]\d{2})?\s+(\d+[.,]\d{2})?\s+(\d+[.,]\d{2})$',
-            # More flexible pattern
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+([\d,]+[.]\d{2}).*?([\d,]+[.]\d{2})$'
-        ]
+        if _LINE_PATTERN_SET is not None and line.isascii():
+            patterns = [_LINE_PATTERNS[i].re2 for i in sorted(_LINE_PATTERN_SET.Match(line) or ())]
+        else:
+            patterns = [pattern.re for pattern in _LINE_PATTERNS]
         
         for pattern in patterns:
-            match = re.search(pattern, line)
+            match = pattern.search(line)
             if match:
                 groups = match.groups()
                 
@@ -399,25 +911,19 @@ class BankStatementProcessor:
         s = line.strip()
 
         # Match two leading dates or a single leading date
-        dual = re.match(r"^\s*(\d{1,2}[\/-]\d{1,2}[\/-]\d{2,4})\s+(\d{1,2}[\/-]\d{1,2}[\/-]\d{2,4})\b", s)
-        if dual:
-            # Prefer the second (Gregorian) date
-            date_str = dual.group(2)
-            desc_start = dual.end()
-        else:
-            single = re.match(r"^\s*(\d{1,2}[\/-]\d{1,2}[\/-]\d{2,4})\b", s)
-            if not single:
-                return None
-            date_str = single.group(1)
-            desc_start = single.end()
+        leading = _LEADING_DATES_RE.for_text(s).match(s)
+        if not leading:
+            return None
+        # Prefer the second (Gregorian) date
+        date_str = leading.group('d2') or leading.group('d1')
+        desc_start = leading.end()
 
         transaction_date = self._parse_date(date_str)
         if not transaction_date:
             return None
 
-        # Find all decimal numbers (with optional thousands separators) — amounts typically have .dd
-        amount_re = re.compile(r"[-+]?\d{1,3}(?:,\d{3})*(?:\.\d{2})|[-+]?\d+\.\d{2}")
-        matches = list(amount_re.finditer(s))
+        # Find all decimal numbers (with optional thousands separators)
+        matches = list(_AMOUNT_RE.for_text(s).finditer(s))
         if len(matches) < 3:
             return None
 
@@ -442,8 +948,7 @@ class BankStatementProcessor:
         description = ''.join(parts)
 
         # Remove trailing date-time like '05-03- 2025 09:27:30 PM'
-        tail_dt_re = re.compile(r"(\d{1,2}[\/-]\d{1,2}[\/-]\s*\d{2,4}\s+\d{1,2}:\d{2}:\d{2}\s*(?:AM|PM)?)\s*$", re.IGNORECASE)
-        description = tail_dt_re.sub('', description).strip()
+        description = _TAIL_DT_RE.for_text(description).sub('', description).strip()
 
         # Normalize debit/credit as mutually exclusive positive values
         debit_amount = debit_val if (debit_val is not None and debit_val > 0) else None
@@ -470,20 +975,25 @@ class BankStatementProcessor:
 
         # Normalize whitespace and split into lines
         # Remove repeated non-informative lines (headers/footers) and empty lines
-        raw_lines = [re.sub(r"\s+", " ", line).strip() for line in text.splitlines()]
+        raw_lines = [_WHITESPACE_RE.sub(" ", line).strip() for line in text.splitlines()]
 
         # Filter out common header/footer noise
-        header_noise = re.compile(r"(?i)^(date|transaction|description|narration|debit|credit|amount|balance|page\s+\d+|statement|account|opening balance|closing balance)\b")
-        sep_noise = re.compile(r"^[\-=_]{4,}$")
-        lines = [ln for ln in raw_lines if ln and not header_noise.search(ln) and not sep_noise.match(ln)]
+        lines = [
+            ln for ln in raw_lines
+            if ln and not _HEADER_NOISE_RE.for_text(ln).search(ln) and not _SEP_NOISE_RE.for_text(ln).match(ln)
+        ]
 
         if not lines:
             return []
 
-        # Date at line start indicates a new transaction candidate
-        date_start = re.compile(
-            r"^(\d{1,2}[\/-]\d{1,2}[\/-]\d{2,4}|\d{4}[\/-]\d{2}[\/-]\d{2}|\d{1,2}\s+[A-Za-z]{3,}\s+\d{2,4}|[A-Za-z]{3}\s+\d{1,2},\s*\d{2,4})\b"
-        )
+        # Offsets of each line in the joined buffer, to map matches back to lines
+        offsets = {}
+        position = 0
+        for index, ln in enumerate(lines):
+            offsets[position] = index
+            position += len(ln) + 1
+        joined = "\n".join(lines)
+        date_lines = {offsets[m.start()] for m in _DATE_START_RE.for_text(joined).finditer(joined)}
 
         buffer: List[str] = []
         transactions: List[Dict] = []
@@ -504,8 +1014,8 @@ class BankStatementProcessor:
                 transactions.append(tx2)
             buffer.clear()
 
-        for ln in lines:
-            if date_start.match(ln):
+        for index, ln in enumerate(lines):
+            if index in date_lines:
                 # new transaction starts; flush previous
                 flush_buffer()
                 buffer.append(ln)
@@ -522,72 +1032,33 @@ class BankStatementProcessor:
 
         return transactions
     
-    def _parse_row_to_transaction(self, row, date_col, desc_col, debit_col, credit_col, balance_col) -> Optional[Dict]:
-        """Parse DataFrame row to transaction"""
-        try:
-            # Parse date
-            date_value = row[date_col] if date_col else None
-            transaction_date = self._parse_date(str(date_value)) if date_value else None
-            
-            if not transaction_date:
-                return None
-            
-            # Parse description
-            description = str(row[desc_col]).strip() if desc_col else ''
-            if not description or description == 'nan':
-                return None
-            
-            # Parse amounts
-            debit_amount = self._parse_amount(str(row[debit_col])) if debit_col else None
-            credit_amount = self._parse_amount(str(row[credit_col])) if credit_col else None
-            balance = self._parse_amount(str(row[balance_col])) if balance_col else None
-            
-            return {
-                'transaction_date': transaction_date,
-                'description': description,
-                'raw_description': ' '.join([str(v) for v in row.values]),
-                'debit_amount': debit_amount if debit_amount > 0 else None,
-                'credit_amount': credit_amount if credit_amount > 0 else None,
-                'balance': balance,
-                'confidence_score': 1.0
-            }
-        except Exception as e:
-            self._log_warning(f"Error parsing row: {str(e)}")
-            return None
-    
-    def _find_date_column(self, df: pd.DataFrame) -> Optional[str]:
-        """Find the date column in DataFrame"""
-        date_keywords = ['date', 'transaction date', 'value date', 'posting date']
-        
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if any(keyword in col_lower for keyword in date_keywords):
-                return col
+    def _find_date_column(self, df: pd.DataFrame) -> Optional[int]:
+        """Find the position of the date column in DataFrame"""
+        col = self._column_by_keywords(df, _HEADER_KEYWORDS['date'])
+        if col is not None:
+            return col
         
         # Check first few rows for date patterns
-        for col in df.columns:
-            sample_values = df[col].head(5).astype(str)
+        for col in range(df.shape[1]):
+            sample_values = df.iloc[:5, col].astype(str)
             date_count = sum(1 for val in sample_values if self._parse_date(val))
             if date_count >= 2:  # At least 2 valid dates
                 return col
         
         return None
     
-    def _find_description_column(self, df: pd.DataFrame) -> Optional[str]:
-        """Find the description column in DataFrame"""
-        desc_keywords = ['description', 'narration', 'particulars', 'details', 'transaction details']
-        
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if any(keyword in col_lower for keyword in desc_keywords):
-                return col
+    def _find_description_column(self, df: pd.DataFrame) -> Optional[int]:
+        """Find the position of the description column in DataFrame"""
+        col = self._column_by_keywords(df, _HEADER_KEYWORDS['description'])
+        if col is not None:
+            return col
         
         # Find column with longest average text length
         text_lengths = {}
-        for col in df.columns:
+        for col in range(df.shape[1]):
             try:
                 # Convert to string and calculate average length
-                col_series = df[col].astype(str)
+                col_series = df.iloc[:, col].astype(str)
                 avg_length = col_series.str.len().mean()
                 text_lengths[col] = avg_length
             except (AttributeError, TypeError):
@@ -599,22 +1070,13 @@ class BankStatementProcessor:
         
         return None
     
-    def _find_amount_column(self, df: pd.DataFrame, amount_type: str) -> Optional[str]:
-        """Find amount columns (debit, credit, balance) in DataFrame"""
-        keywords = {
-            'debit': ['debit', 'withdrawal', 'dr', 'debit amount'],
-            'credit': ['credit', 'deposit', 'cr', 'credit amount'],
-            'balance': ['balance', 'closing balance', 'running balance']
-        }
-        
-        target_keywords = keywords.get(amount_type, [])
-        
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if any(keyword in col_lower for keyword in target_keywords):
-                return col
-        
-        return None
+    def _find_amount_column(self, df: pd.DataFrame, amount_type: str) -> Optional[int]:
+        """Find the position of an amount column (debit, credit, balance) in DataFrame"""
+        return self._column_by_keywords(df, _AMOUNT_COLUMN_KEYWORDS.get(amount_type, ()))
+    
+    def _column_by_keywords(self, df: pd.DataFrame, keywords: Tuple[str, ...]) -> Optional[int]:
+        """Position of the first column whose name contains one of keywords (memoized on the column names)"""
+        return _match_column(tuple(str(c) for c in df.columns), keywords)
     
     def _generate_header_from_words(self, words: List[Dict], y_tolerance: float = 3.0) -> List[str]:
         """
@@ -627,32 +1089,31 @@ class BankStatementProcessor:
         Returns:
             List of header column names (left-to-right order)
         """
-        import itertools
-        
         if not words:
             return []
 
-        # Sort words by vertical position (top)
-        words_sorted = sorted(words, key=lambda w: float(w.get('top', 0.0)))
-
         # --- Step 1: group words by y position (header lines) ---
-        lines = []
-        for _, group in itertools.groupby(words_sorted, key=lambda w: round(w["top"] / y_tolerance)):
-            line_words = sorted(list(group), key=lambda w: w["x0"])
-            lines.append(line_words)
+        # Stable sort by top, then a new line wherever the rounded position changes
+        tops = np.fromiter((float(w.get('top', 0.0)) for w in words), dtype=float, count=len(words))
+        order = np.argsort(tops, kind='stable')
+        line_keys = np.round(tops[order] / y_tolerance)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(line_keys)) + 1))
+        ends = np.append(starts[1:], len(order))
 
         # --- Step 2: find the header line ---
         # Heuristic: the line containing "Date", "Debit", "Credit", or "Balance" is likely the header
-        header_line = None
-        for line in lines:
-            texts = [w["text"] for w in line]
-            if any(t.lower() in ["date", "debit", "credit", "balance", "transaction"] for t in texts):
-                header_line = line
+        header_indices = None
+        for start, end in zip(starts, ends):
+            if any(words[i]["text"].lower() in _HEADER_LINE_WORDS for i in order[start:end]):
+                header_indices = order[start:end]
                 break
 
-        if not header_line:
+        if header_indices is None:
             # fallback: take the line with the most words near the top
-            header_line = max(lines, key=lambda l: len(l))
+            longest = int(np.argmax(ends - starts))
+            header_indices = order[starts[longest]:ends[longest]]
+
+        header_line = sorted((words[i] for i in header_indices), key=lambda w: w["x0"])
 
         # --- Step 3: merge adjacent words that belong to same column header ---
         merged_headers = []
@@ -689,32 +1150,11 @@ class BankStatementProcessor:
             else:
                 lines[-1]['words'].append(w)
         
-        # Define header keyword synonyms
-        keywords: Dict[str, List[str]] = {
-            'date': ['date', 'transaction date', 'value date', 'posting date'],
-            'description': ['description', 'narration', 'particulars', 'details', 'transaction details'],
-            'debit': ['debit', 'withdrawal', 'dr', 'debit amount'],
-            'credit': ['credit', 'deposit', 'cr', 'credit amount'],
-            'amount': ['amount', 'transaction amount'],
-            'balance': ['balance', 'closing balance', 'running balance']
-        }
-        
         def _line_score(line_words: List[Dict]) -> int:
-            toks = [str(w.get('text', '')).strip().lower() for w in line_words if str(w.get('text', '')).strip()]
-            score = 0
-            for i in range(len(toks)):
-                uni = toks[i]
-                if any(k in uni for kws in keywords.values() for k in kws):
-                    score += 1
-                if i + 1 < len(toks):
-                    bi = f"{toks[i]} {toks[i+1]}"
-                    if any(k in bi for kws in keywords.values() for k in kws):
-                        score += 1
-                if i + 2 < len(toks):
-                    tri = f"{toks[i]} {toks[i+1]} {toks[i+2]}"
-                    if any(k in tri for kws in keywords.values() for k in kws):
-                        score += 1
-            return score
+            return sum(
+                1 for grams in _token_ngrams(_word_tokens(line_words))
+                for gram in grams if _ANY_HEADER_KEYWORD_RE.search(gram)
+            )
         
         # Pick the best candidate line that likely contains the header
         best_line = max(lines, key=lambda L: _line_score(L['words'])) if lines else None
@@ -723,41 +1163,26 @@ class BankStatementProcessor:
         
         # Sort selected line's words left-to-right
         selected_words = sorted(best_line['words'], key=lambda w: float(w.get('x0', 0.0)))
-        toks = [str(w.get('text', '')).strip().lower() for w in selected_words if str(w.get('text', '')).strip()]
+        # n-grams for every position are built once; index i is the n-gram starting at token i
+        unigrams, bigrams, trigrams = _token_ngrams(_word_tokens(selected_words))
         
         # Build ordered normalized headers by scanning trigrams -> bigrams -> unigrams
         header: List[str] = []
         i = 0
-        while i < len(toks):
+        while i < len(unigrams):
             matched_name: Optional[str] = None
             matched_len = 1
-            # Try trigram
-            if i + 2 < len(toks):
-                tri = f"{toks[i]} {toks[i+1]} {toks[i+2]}"
-                for name, kws in keywords.items():
-                    if any(k in tri for k in kws):
-                        matched_name = name
-                        matched_len = 3
-                        break
-            # Try bigram
-            if matched_name is None and i + 1 < len(toks):
-                bi = f"{toks[i]} {toks[i+1]}"
-                for name, kws in keywords.items():
-                    if any(k in bi for k in kws):
-                        matched_name = name
-                        matched_len = 2
-                        break
-            # Try unigram
-            if matched_name is None:
-                uni = toks[i]
-                for name, kws in keywords.items():
-                    if any(k in uni for k in kws):
-                        matched_name = name
-                        matched_len = 1
+            for matched_len, grams in ((3, trigrams), (2, bigrams), (1, unigrams)):
+                if i < len(grams):
+                    matched_name = next((name for name, name_re in _HEADER_NAME_RES if name_re.search(grams[i])), None)
+                    if matched_name is not None:
                         break
             
             if matched_name is not None and matched_name not in header:
                 header.append(matched_name)
+                if len(header) == len(_HEADER_NAME_RES):
+                    # Every column name is taken; later tokens can only be skipped
+                    break
                 i += matched_len
             else:
                 i += 1
@@ -766,78 +1191,39 @@ class BankStatementProcessor:
     
     def _parse_date(self, date_str: str) -> Optional[date]:
         """Parse date string to date object"""
-        if not date_str or date_str.lower() in ['nan', 'none', '']:
-            return None
-        
-        # Common date formats
-        formats = [
-            '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y',
-            '%d/%m/%y', '%d-%m-%y', '%d.%m.%y',
-            '%Y-%m-%d', '%Y/%m/%d',
-            '%m/%d/%Y', '%m-%d-%Y',
-            '%d %b %Y', '%d %B %Y',
-            '%b %d, %Y', '%B %d, %Y'
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str.strip(), fmt).date()
-            except ValueError:
-                continue
-        
-        return None
+        return _parse_date_cached(date_str)
     
     def _parse_amount(self, amount_str: str) -> Optional[Decimal]:
         """Parse amount string to Decimal"""
-        if not amount_str or amount_str.lower() in ['nan', 'none', '']:
-            return None
-        
-        # Clean the amount string
-        amount_str = str(amount_str).strip()
-        amount_str = re.sub(r'[^\d.,\-]', '', amount_str)  # Remove non-numeric chars except .,- 
-        
-        if not amount_str:
-            return None
-        
-        # Handle different decimal separators
-        if ',' in amount_str and '.' in amount_str:
-            # Assume comma is thousands separator
-            amount_str = amount_str.replace(',', '')
-        elif ',' in amount_str and amount_str.count(',') == 1 and len(amount_str.split(',')[1]) == 2:
-            # Comma as decimal separator
-            amount_str = amount_str.replace(',', '.')
-        
-        try:
-            return Decimal(amount_str)
-        except (InvalidOperation, ValueError):
-            return None
+        return _parse_amount_cached(amount_str)
     
     def _log_info(self, message: str):
         """Log info message"""
         logger.info(message)
-        ProcessingLog.objects.create(
-            statement=self.statement,
-            level='info',
-            message=message
-        )
+        self._buffer_log('info', message)
     
     def _log_warning(self, message: str):
         """Log warning message"""
         logger.warning(message)
-        ProcessingLog.objects.create(
-            statement=self.statement,
-            level='warning',
-            message=message
-        )
+        self._buffer_log('warning', message)
     
     def _log_error(self, message: str):
         """Log error message"""
         logger.error(message)
-        ProcessingLog.objects.create(
-            statement=self.statement,
-            level='error',
-            message=message
-        )
+        self._buffer_log('error', message)
+    
+    def _buffer_log(self, level: str, message: str):
+        """Queue a ProcessingLog row; written in batches by _flush_logs"""
+        self._log_buffer.append(ProcessingLog(statement=self.statement, level=level, message=message))
+        if len(self._log_buffer) >= _LOG_FLUSH_SIZE:
+            self._flush_logs()
+    
+    def _flush_logs(self):
+        """Write buffered ProcessingLog rows with a single bulk INSERT"""
+        if not self._log_buffer:
+            return
+        batch, self._log_buffer = self._log_buffer, []
+        ProcessingLog.objects.bulk_create(batch, batch_size=_LOG_FLUSH_SIZE)
 
     def classify_pdf(self, pdf_path):
         """
@@ -866,16 +1252,10 @@ class BankStatementProcessor:
                     if block[6] == 0:  # block[6] is the block type
                         total_text_area += abs(fitz.Rect(block[:4]))
 
-                # Calculate image area (by checking for image blocks)
-                image_list = page.get_images(full=True)
-                for img in image_list:
-                    xref = img[0]
-                    s = doc.extract_image(xref)
-                    # Estimate image area based on image dimensions, or more accurately
-                    # by checking if it's rendered as a block on the page.
-                    # For simplicity here, we'll consider the presence of images.
-                    # A more robust approach might involve checking image block areas.
-                    total_image_area += 1 # Increment for each image found, a more precise calculation would be better.
+                # Count images from the page's xref table; decoding them
+                # (doc.extract_image) is not needed just to detect presence.
+                # A more precise calculation would use the rendered image areas.
+                total_image_area += len(page.get_images(full=True))
 
             doc.close()
 
@@ -897,13 +1277,8 @@ class DataCleaner:
         """Clean and normalize transaction description text"""
         if description is None:
             return ""
-        # Remove control characters
-        desc = re.sub(r'[\r\n\t]', ' ', str(description))
-        # Collapse multiple spaces
-        desc = re.sub(r'\s+', ' ', desc)
-        # Trim
-        desc = desc.strip()
-        return desc
+        # \s covers \r\n\t, so one pass both replaces control characters and collapses runs
+        return _WHITESPACE_RE.sub(' ', str(description)).strip()
 
     @staticmethod
     def validate_transaction(transaction_data: Dict) -> Tuple[bool, List[str]]:
@@ -939,32 +1314,41 @@ class DataCleaner:
     @staticmethod
     def detect_duplicates(transactions: List[Dict]) -> List[int]:
         """Detect potential duplicate transactions"""
-        duplicates = []
+        # Duplicates must share date and amounts, so bucket on those and only
+        # compare descriptions within a bucket
+        buckets: Dict[Tuple, List[int]] = defaultdict(list)
+        for i, trans in enumerate(transactions):
+            buckets[(trans.get('transaction_date'), trans.get('debit_amount'), trans.get('credit_amount'))].append(i)
         
-        for i, trans1 in enumerate(transactions):
-            for j, trans2 in enumerate(transactions[i+1:], i+1):
-                if DataCleaner._are_duplicates(trans1, trans2):
-                    duplicates.extend([i, j])
+        duplicates = set()
+        for indices in buckets.values():
+            if len(indices) < 2:
+                continue
+            words = {i: frozenset(transactions[i].get('description', '').lower().split()) for i in indices}
+            for i, j in DataCleaner._candidate_pairs(indices, words):
+                # Similar description (80% similarity)
+                if DataCleaner._jaccard(words[i], words[j]) > 0.8:
+                    duplicates.update((i, j))
         
-        return list(set(duplicates))
+        return sorted(duplicates)
     
     @staticmethod
-    def _are_duplicates(trans1: Dict, trans2: Dict) -> bool:
-        """Check if two transactions are duplicates"""
-        # Same date and amount
-        if (trans1.get('transaction_date') == trans2.get('transaction_date') and
-            trans1.get('debit_amount') == trans2.get('debit_amount') and
-            trans1.get('credit_amount') == trans2.get('credit_amount')):
-            
-            # Similar description (80% similarity)
-            desc1 = trans1.get('description', '').lower()
-            desc2 = trans2.get('description', '').lower()
-            
-            if desc1 and desc2:
-                similarity = DataCleaner._calculate_similarity(desc1, desc2)
-                return similarity > 0.8
+    def _candidate_pairs(indices: List[int], words: Dict[int, frozenset]):
+        """Index pairs within a bucket whose word sets may be similar enough to be duplicates"""
+        if MinHashLSH is None or len(indices) < _MINHASH_MIN_BUCKET:
+            return combinations(indices, 2)
         
-        return False
+        # A looser LSH threshold keeps near-0.8 pairs; the exact Jaccard check decides
+        lsh = MinHashLSH(threshold=0.5, num_perm=_MINHASH_NUM_PERM)
+        signatures = {}
+        for i in indices:
+            if not words[i]:
+                continue  # empty descriptions never pass the exact check
+            signature = MinHash(num_perm=_MINHASH_NUM_PERM)
+            signature.update_batch([word.encode('utf-8') for word in words[i]])
+            lsh.insert(i, signature)
+            signatures[i] = signature
+        return {(min(i, j), max(i, j)) for i, signature in signatures.items() for j in lsh.query(signature) if j != i}
     
     @staticmethod
     def _calculate_similarity(str1: str, str2: str) -> float:
@@ -973,10 +1357,10 @@ class DataCleaner:
             return 0.0
         
         # Simple Jaccard similarity
-        set1 = set(str1.split())
-        set2 = set(str2.split())
-        
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        
-        return intersection / union if union > 0 else 0.0
+        return DataCleaner._jaccard(set(str1.split()), set(str2.split()))
+    
+    @staticmethod
+    def _jaccard(set1, set2) -> float:
+        """Jaccard similarity of two word sets"""
+        union = len(set1 | set2)
+        return len(set1 & set2) / union if union > 0 else 0.0
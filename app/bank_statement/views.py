@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.core.paginator import Paginator
@@ -131,21 +131,28 @@ def process_statement_sync(statement):
         duplicate_indices = DataCleaner.detect_duplicates(valid_transactions)
         
         # Save valid transactions
-        saved_count = 0
+        new_transactions = []
+        for i, trans_data in enumerate(valid_transactions):
+            if i not in duplicate_indices:
+                txn = Transaction(
+                    statement=statement,
+                    transaction_date=trans_data['transaction_date'],
+                    description=trans_data['description'],
+                    raw_description=trans_data.get('raw_description', ''),
+                    debit_amount=trans_data.get('debit_amount'),
+                    credit_amount=trans_data.get('credit_amount'),
+                    balance=trans_data.get('balance'),
+                    confidence_score=trans_data.get('confidence_score', 1.0)
+                )
+                txn.classify()  # bulk_create bypasses Transaction.save()
+                new_transactions.append(txn)
+        
         with db_transaction.atomic():
-            for i, trans_data in enumerate(valid_transactions):
-                if i not in duplicate_indices:
-                    Transaction.objects.create(
-                        statement=statement,
-                        transaction_date=trans_data['transaction_date'],
-                        description=trans_data['description'],
-                        raw_description=trans_data.get('raw_description', ''),
-                        debit_amount=trans_data.get('debit_amount'),
-                        credit_amount=trans_data.get('credit_amount'),
-                        balance=trans_data.get('balance'),
-                        confidence_score=trans_data.get('confidence_score', 1.0)
-                    )
-                    saved_count += 1
+            # ignore_conflicts doesn't report how many rows landed, so count around the insert
+            existing_count = statement.transactions.count()
+            # unique_together is a DB constraint, so remaining duplicates are dropped by the INSERT itself
+            Transaction.objects.bulk_create(new_transactions, batch_size=1000, ignore_conflicts=True)
+            saved_count = statement.transactions.count() - existing_count
         
         # Update statement status
         statement.processing_status = 'completed'
@@ -279,7 +286,7 @@ def statement_detail(request, pk):
     stats['net_amount'] = stats['total_credits'] - stats['total_debits']
     
     # Processing logs
-    logs = ProcessingLog.objects.filter(statement=statement).order_by('-timestamp')[:10]
+    logs = ProcessingLog.objects.filter(statement=statement).order_by('-timestamp', '-id')[:10]
     
     context = {
         'statement': statement,
@@ -377,6 +384,85 @@ def transaction_delete(request, pk):
     })
 
 
+# Columns the exports read; raw_description and the rest stay in the DB
+_EXPORT_COLUMNS = (
+    'transaction_date', 'description', 'debit_amount', 'credit_amount',
+    'balance', 'confidence_score'
+)
+
+_EXPORT_HEADERS = [
+    ('date', 'Date'),
+    ('description', 'Description'),
+    ('debit', 'Debit Amount'),
+    ('credit', 'Credit Amount'),
+    ('balance', 'Balance'),
+    ('confidence', 'Confidence Score'),
+]
+
+
+class _Echo:
+    """Pseudo-buffer whose write() hands the line back, so csv.writer can feed a generator"""
+    
+    def write(self, value):
+        return value
+
+
+def _export_rows(transactions):
+    """Iterate export rows in chunks instead of loading the whole queryset"""
+    return transactions.only(*_EXPORT_COLUMNS).iterator(chunk_size=2000)
+
+
+def _stream_csv(transactions, fields):
+    """Yield CSV lines (header first) for the requested export fields"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([label for key, label in _EXPORT_HEADERS if key in fields])
+    
+    for transaction in _export_rows(transactions):
+        row = []
+        if 'date' in fields:
+            row.append(transaction.transaction_date.strftime('%Y-%m-%d'))
+        if 'description' in fields:
+            row.append(transaction.description)
+        if 'debit' in fields:
+            row.append(str(transaction.debit_amount) if transaction.debit_amount else '')
+        if 'credit' in fields:
+            row.append(str(transaction.credit_amount) if transaction.credit_amount else '')
+        if 'balance' in fields:
+            row.append(str(transaction.balance) if transaction.balance else '')
+        if 'confidence' in fields:
+            row.append(f"{transaction.confidence_score:.2f}")
+        yield writer.writerow(row)
+
+
+def _build_xlsx(transactions, fields):
+    """Build the XLSX bytes with a write-only workbook, appending rows as they're read"""
+    import openpyxl
+    
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Transactions')
+    sheet.append([label for key, label in _EXPORT_HEADERS if key in fields])
+    
+    for transaction in _export_rows(transactions):
+        row = []
+        if 'date' in fields:
+            row.append(transaction.transaction_date)
+        if 'description' in fields:
+            row.append(transaction.description)
+        if 'debit' in fields:
+            row.append(transaction.debit_amount)
+        if 'credit' in fields:
+            row.append(transaction.credit_amount)
+        if 'balance' in fields:
+            row.append(transaction.balance)
+        if 'confidence' in fields:
+            row.append(transaction.confidence_score)
+        sheet.append(row)
+    
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
 @login_required
 def export_all_transactions(request):
     """Export all transactions across user's statements, respecting filters via GET and format param."""
@@ -432,44 +518,8 @@ def export_all_transactions(request):
 
 def export_all_csv(transactions, fields):
     """Export all filtered transactions to CSV."""
-    response = HttpResponse(content_type='text/csv')
+    response = StreamingHttpResponse(_stream_csv(transactions, fields), content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="all_transactions_{timezone.now().strftime("%Y%m%d")}.csv"'
-
-    writer = csv.writer(response)
-
-    # Header
-    header = []
-    if 'date' in fields:
-        header.append('Date')
-    if 'description' in fields:
-        header.append('Description')
-    if 'debit' in fields:
-        header.append('Debit Amount')
-    if 'credit' in fields:
-        header.append('Credit Amount')
-    if 'balance' in fields:
-        header.append('Balance')
-    if 'confidence' in fields:
-        header.append('Confidence Score')
-    writer.writerow(header)
-
-    # Rows
-    for transaction in transactions:
-        row = []
-        if 'date' in fields:
-            row.append(transaction.transaction_date.strftime('%Y-%m-%d'))
-        if 'description' in fields:
-            row.append(transaction.description)
-        if 'debit' in fields:
-            row.append(str(transaction.debit_amount) if transaction.debit_amount else '')
-        if 'credit' in fields:
-            row.append(str(transaction.credit_amount) if transaction.credit_amount else '')
-        if 'balance' in fields:
-            row.append(str(transaction.balance) if transaction.balance else '')
-        if 'confidence' in fields:
-            row.append(f"{transaction.confidence_score:.2f}")
-        writer.writerow(row)
-
     return response
 
 
@@ -477,35 +527,11 @@ def export_all_excel(transactions, fields):
     """Export all filtered transactions to Excel."""
     try:
         import openpyxl
-        import pandas as pd
     except ImportError:
         return JsonResponse({'error': 'Excel export not available'}, status=400)
 
-    data = []
-    for transaction in transactions:
-        row = {}
-        if 'date' in fields:
-            row['Date'] = transaction.transaction_date
-        if 'description' in fields:
-            row['Description'] = transaction.description
-        if 'debit' in fields:
-            row['Debit Amount'] = transaction.debit_amount
-        if 'credit' in fields:
-            row['Credit Amount'] = transaction.credit_amount
-        if 'balance' in fields:
-            row['Balance'] = transaction.balance
-        if 'confidence' in fields:
-            row['Confidence Score'] = transaction.confidence_score
-        data.append(row)
-
-    df = pd.DataFrame(data)
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Transactions', index=False)
-    output.seek(0)
-
     response = HttpResponse(
-        output.getvalue(),
+        _build_xlsx(transactions, fields),
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
     response['Content-Disposition'] = f'attachment; filename="all_transactions_{timezone.now().strftime("%Y%m%d")}.xlsx"'
@@ -515,7 +541,7 @@ def export_all_excel(transactions, fields):
 def export_all_json(transactions, fields):
     """Export all filtered transactions to JSON."""
     data = []
-    for transaction in transactions:
+    for transaction in _export_rows(transactions):
         row = {}
         if 'date' in fields:
             row['date'] = transaction.transaction_date.isoformat()
@@ -569,40 +595,8 @@ def export_data(request, pk):
 
 def export_csv(transactions, fields, statement):
     """Export a single statement's transactions to CSV"""
-    response = HttpResponse(content_type='text/csv')
+    response = StreamingHttpResponse(_stream_csv(transactions, fields), content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="{statement.bank_name}_{statement.statement_period}_transactions.csv"'
-    
-    writer = csv.writer(response)
-    header = []
-    if 'date' in fields:
-        header.append('Date')
-    if 'description' in fields:
-        header.append('Description')
-    if 'debit' in fields:
-        header.append('Debit Amount')
-    if 'credit' in fields:
-        header.append('Credit Amount')
-    if 'balance' in fields:
-        header.append('Balance')
-    if 'confidence' in fields:
-        header.append('Confidence Score')
-    writer.writerow(header)
-    
-    for transaction in transactions:
-        row = []
-        if 'date' in fields:
-            row.append(transaction.transaction_date.strftime('%Y-%m-%d'))
-        if 'description' in fields:
-            row.append(transaction.description)
-        if 'debit' in fields:
-            row.append(str(transaction.debit_amount) if transaction.debit_amount else '')
-        if 'credit' in fields:
-            row.append(str(transaction.credit_amount) if transaction.credit_amount else '')
-        if 'balance' in fields:
-            row.append(str(transaction.balance) if transaction.balance else '')
-        if 'confidence' in fields:
-            row.append(f"{transaction.confidence_score:.2f}")
-        writer.writerow(row)
     return response
 
 
@@ -610,35 +604,11 @@ def export_excel(transactions, fields, statement):
     """Export a single statement's transactions to Excel"""
     try:
         import openpyxl
-        import pandas as pd
     except ImportError:
         return JsonResponse({'error': 'Excel export not available'}, status=400)
     
-    data = []
-    for transaction in transactions:
-        row = {}
-        if 'date' in fields:
-            row['Date'] = transaction.transaction_date
-        if 'description' in fields:
-            row['Description'] = transaction.description
-        if 'debit' in fields:
-            row['Debit Amount'] = transaction.debit_amount
-        if 'credit' in fields:
-            row['Credit Amount'] = transaction.credit_amount
-        if 'balance' in fields:
-            row['Balance'] = transaction.balance
-        if 'confidence' in fields:
-            row['Confidence Score'] = transaction.confidence_score
-        data.append(row)
-    
-    df = pd.DataFrame(data)
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Transactions', index=False)
-    output.seek(0)
-    
     response = HttpResponse(
-        output.getvalue(),
+        _build_xlsx(transactions, fields),
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
     response['Content-Disposition'] = f'attachment; filename="{statement.bank_name}_{statement.statement_period}_transactions.xlsx"'
@@ -648,7 +618,7 @@ def export_excel(transactions, fields, statement):
 def export_json(transactions, fields, statement):
     """Export a single statement's transactions to JSON"""
     data = []
-    for transaction in transactions:
+    for transaction in _export_rows(transactions):
         row = {}
         if 'date' in fields:
             row['date'] = transaction.transaction_date.isoformat()
@@ -757,6 +727,6 @@ def processing_status(request, pk):
                 'message': log.message,
                 'created_at': log.timestamp.isoformat()
             }
-            for log in statement.processing_logs.order_by('-timestamp')[:5]
+            for log in statement.processing_logs.order_by('-timestamp', '-id')[:5]
         ]
     })
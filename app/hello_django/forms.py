@@ -0,0 +1,22 @@
+from copy import copy
+
+from django.utils.functional import cached_property
+from crispy_forms.helper import FormHelper
+
+
+class LazyFormHelperMixin:
+    """
+    Build the crispy FormHelper on first access instead of in __init__,
+    so bound forms that validate and redirect never construct it
+    """
+    _LAYOUT = None
+    _HELPER_ATTRS = {}
+    
+    @cached_property
+    def helper(self):
+        helper = FormHelper()
+        for name, value in self._HELPER_ATTRS.items():
+            # Class-level values are shared; give each helper its own copy
+            setattr(helper, name, copy(value))
+        helper.layout = self._LAYOUT
+        return helper
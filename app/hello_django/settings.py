@@ -149,6 +149,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom User Model
 AUTH_USER_MODEL = 'authentication.User'
 
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.EmailBackend',
+]
+
 # Authentication Settings
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = '/'
@@ -256,6 +260,7 @@ LOGGING = {
 # Crispy Forms Configuration
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
+CRISPY_FAIL_SILENTLY = not DEBUG
 
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
@@ -277,3 +282,8 @@ CELERY_TIMEZONE = TIME_ZONE
 TESSERACT_CMD = os.environ.get('TESSERACT_CMD', '/usr/bin/tesseract')
 PDF_PROCESSING_TIMEOUT = 300  # 5 minutes
 OCR_PROCESSING_TIMEOUT = 600  # 10 minutes
+OCR_EARLY_EXIT_CONFIDENCE = 85.0  # stop trying PSM configs once a page reaches this mean confidence
+# Parsed transactions keyed by statement and file SHA-256; kept outside MEDIA_ROOT so it is never served.
+# Entries for encrypted statements are Fernet-encrypted with the statement's key.
+STATEMENT_CACHE_DIR = os.environ.get('STATEMENT_CACHE_DIR', BASE_DIR / 'statement_cache')
+STATEMENT_CACHE_MAX_AGE = 7 * 24 * 60 * 60  # seconds; older entries are ignored and pruned
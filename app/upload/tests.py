@@ -25,7 +25,7 @@ class FileUploadTests(TestCase):
         
     def test_file_list_view(self):
         # Login the user
-        self.client.login(username='testuser', password='testpassword')
+        self.client.force_login(self.user)
         
         # Get the file list page
         response = self.client.get(reverse('file_list'))
@@ -38,7 +38,7 @@ class FileUploadTests(TestCase):
     
     def test_file_upload_view(self):
         # Login the user
-        self.client.login(username='testuser', password='testpassword')
+        self.client.force_login(self.user)
         
         # Create a test file
         test_file = SimpleUploadedFile(